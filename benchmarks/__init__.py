@@ -0,0 +1 @@
+"""Local OREI matrix simulator and performance benchmarks."""
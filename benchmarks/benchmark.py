@@ -0,0 +1,308 @@
+"""Performance benchmarks for the OREI Matrix client/coordinator hot path.
+
+Runs real ``OreiMatrixClient`` and ``OreiMatrixCoordinator`` instances
+against local :class:`~benchmarks.simulator.MatrixSimulator` servers and
+reports:
+
+* poll-cycle latency — one full coordinator refresh (all status sections),
+  with the device's answers unchanged between polls (the usual case, where
+  byte-identical bodies skip decoding and parsing) and with every answer
+  changed;
+* command-to-confirmation latency — ``video switch`` until a video status
+  poll (or, with ``--transport tcp``, pushed feedback) reports the new route;
+* requests per second — 1 to 50 matrices polling back to back through the
+  shared fleet scheduler;
+* discovery sweep — config-flow discovery of ``127.0.0.0/24`` with several
+  simulators listening on loopback addresses (Linux, where all of
+  127.0.0.0/8 is local).
+
+Requires Home Assistant in the environment (as for development)::
+
+    python -m benchmarks.benchmark --latency 5 --output bench_output.txt
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import logging
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+
+from custom_components.orei_matrix.client import OreiMatrixClient
+from custom_components.orei_matrix.coordinator import OreiMatrixCoordinator
+from custom_components.orei_matrix.discovery import async_discover, parse_hosts
+from custom_components.orei_matrix.scheduler import OreiMatrixFleetScheduler
+from custom_components.orei_matrix.transport import HttpTransport, TcpTransport
+
+from .simulator import MatrixSimulator
+
+FLEET_SIZES = (1, 5, 10, 25, 50)
+
+# Initial polls tried per matrix before it is left out of a benchmark
+FIRST_REFRESH_ATTEMPTS = 10
+
+
+def _summary(samples: list[float]) -> str:
+    """Format latency samples (seconds) as p50/p95/max in milliseconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+    return (
+        f"p50 {statistics.median(ordered) * 1000:7.2f} ms  "
+        f"p95 {p95 * 1000:7.2f} ms  "
+        f"max {ordered[-1] * 1000:7.2f} ms  (n={len(ordered)})"
+    )
+
+
+async def _timed(samples: list[float], call: Callable[[], Awaitable]) -> None:
+    """Await ``call`` and append its duration to ``samples``."""
+    start = time.perf_counter()
+    await call()
+    samples.append(time.perf_counter() - start)
+
+
+async def _first_refresh(coordinator: OreiMatrixCoordinator) -> int:
+    """Refresh until the simulator has been polled once.
+
+    Returns the number of failed attempts. ``coordinator.data`` is still None
+    if all ``FIRST_REFRESH_ATTEMPTS`` failed (e.g. with ``--error-rate 1``).
+    """
+    for failures in range(FIRST_REFRESH_ATTEMPTS):
+        await coordinator.async_refresh()
+        if coordinator.data is not None:
+            return failures
+    return FIRST_REFRESH_ATTEMPTS
+
+
+def _failed(count: int, what: str) -> str:
+    """Format a failure count for a report line, or nothing if none failed."""
+    return f"  (failed {what}: {count})" if count else ""
+
+
+class _Bench:
+    """Simulators, clients and coordinators for one benchmark run."""
+
+    def __init__(self, hass: HomeAssistant, args: argparse.Namespace) -> None:
+        self.hass = hass
+        self.args = args
+        self.simulators: list[MatrixSimulator] = []
+        self.clients: list[OreiMatrixClient] = []
+
+    async def matrix(
+        self, scheduler: OreiMatrixFleetScheduler | None = None
+    ) -> tuple[MatrixSimulator, OreiMatrixCoordinator]:
+        """Start a simulator and return it with a coordinator polling it."""
+        sim = MatrixSimulator(
+            self.args.inputs,
+            self.args.outputs,
+            latency=self.args.latency / 1000,
+            jitter=self.args.jitter / 1000,
+            error_rate=self.args.error_rate,
+            seed=len(self.simulators),
+        )
+        port = await sim.start()
+        self.simulators.append(sim)
+        transport = HttpTransport("127.0.0.1", port)
+        if self.args.transport == "tcp":
+            transport = TcpTransport("127.0.0.1", await sim.start_tcp(), transport)
+        client = OreiMatrixClient(
+            "127.0.0.1",
+            limiter=scheduler.request_slot if scheduler else None,
+            transport=transport,
+        )
+        self.clients.append(client)
+        coordinator = OreiMatrixCoordinator(self.hass, client)
+        if scheduler is not None:
+            scheduler.async_register(f"sim{len(self.simulators)}", coordinator)
+        return sim, coordinator
+
+    async def close(self) -> None:
+        """Close every client and stop every simulator."""
+        for client in self.clients:
+            await client.async_close()
+        for sim in self.simulators:
+            await sim.stop()
+        self.clients.clear()
+        self.simulators.clear()
+
+
+async def bench_poll_cycle(bench: _Bench, report: Callable[[str], None]) -> None:
+    """Measure one full coordinator refresh against a single matrix."""
+    sim, coordinator = await bench.matrix()
+    # Also warms up the keep-alive connection
+    initial_failures = await _first_refresh(coordinator)
+    if coordinator.data is None:
+        report("poll cycle                    initial poll failed")
+        return
+    samples: list[float] = []
+    for _ in range(bench.args.iterations):
+        await _timed(samples, coordinator.async_refresh)
+    report(
+        f"poll cycle, unchanged         {_summary(samples)}"
+        f"{_failed(initial_failures, 'initial polls')}"
+    )
+
+    samples = []
+    for idx in range(bench.args.iterations):
+        # Change something in every section so each body must be parsed
+        sim.routing[0] = idx % sim.num_inputs + 1
+        sim.output_connected[0] = not sim.output_connected[0]
+        sim.input_active[0] = not sim.input_active[0]
+        await _timed(samples, coordinator.async_refresh)
+    report(f"poll cycle, changed           {_summary(samples)}")
+
+
+async def bench_confirm(bench: _Bench, report: Callable[[str], None]) -> None:
+    """Measure routing command to confirmed state on a single matrix."""
+    sim, coordinator = await bench.matrix()
+    initial_failures = await _first_refresh(coordinator)
+    if coordinator.data is None:
+        report("command -> confirmation       initial poll failed")
+        return
+    samples: list[float] = []
+    failures = 0
+    for idx in range(bench.args.iterations):
+        output_num = idx % sim.num_outputs + 1
+        input_num = (coordinator.data.route(output_num) or 0) % sim.num_inputs + 1
+        start = time.monotonic()
+        try:
+            await coordinator.client.video_switch(input_num, output_num)
+        except ConnectionError:
+            failures += 1
+            continue
+        latency = await coordinator.async_confirm_routing(
+            {output_num: input_num}, start
+        )
+        if latency is not None:
+            samples.append(latency)
+    result = _summary(samples) if samples else "no route was confirmed"
+    report(
+        f"command -> confirmation       {result}{_failed(failures, 'commands')}"
+        f"{_failed(initial_failures, 'initial polls')}"
+    )
+
+
+async def bench_fleet(
+    bench: _Bench, report: Callable[[str], None], count: int
+) -> None:
+    """Measure request throughput with ``count`` matrices polling flat out."""
+    scheduler = OreiMatrixFleetScheduler()
+    matrices = [await bench.matrix(scheduler) for _ in range(count)]
+    initial_failures = 0
+    for _, coordinator in matrices:
+        initial_failures += await _first_refresh(coordinator)
+    # Leave out matrices that never answered
+    matrices = [(sim, coord) for sim, coord in matrices if coord.data is not None]
+    if not matrices:
+        report(f"fleet {count:3d} matrices  initial poll failed")
+        return
+    before = sum(sim.total_requests for sim, _ in matrices)
+    cycles: list[float] = []
+    deadline = time.perf_counter() + bench.args.duration
+
+    async def _poll(coordinator: OreiMatrixCoordinator) -> None:
+        while time.perf_counter() < deadline:
+            await _timed(cycles, coordinator.async_refresh)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_poll(coordinator) for _, coordinator in matrices))
+    elapsed = time.perf_counter() - start
+    served = sum(sim.total_requests for sim, _ in matrices) - before
+    report(
+        f"fleet {count:3d} matrices  {served / elapsed:8.1f} req/s  "
+        f"cycle {_summary(cycles)}{_failed(initial_failures, 'initial polls')}"
+    )
+
+
+async def bench_discovery(
+    bench: _Bench, report: Callable[[str], None], count: int
+) -> None:
+    """Measure a /24 discovery sweep with ``count`` simulators answering."""
+    port = 0
+    for idx in range(count):
+        sim = MatrixSimulator(bench.args.inputs, bench.args.outputs, seed=idx)
+        # Same port on consecutive loopback addresses, as on a real subnet
+        port = await sim.start(f"127.0.0.{idx + 10}", port)
+        bench.simulators.append(sim)
+    async with aiohttp.ClientSession() as session:
+        start = time.perf_counter()
+        found = await async_discover(session, parse_hosts("127.0.0.0/24"), port=port)
+        elapsed = time.perf_counter() - start
+    report(
+        f"discovery sweep /24          {elapsed * 1000:7.1f} ms  "
+        f"found {len(found)}/{count}"
+    )
+
+
+async def _run(args: argparse.Namespace, report: Callable[[str], None]) -> None:
+    """Run every benchmark in a throwaway Home Assistant instance."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        bench = _Bench(hass, args)
+        report(
+            f"OREI matrix benchmark: {args.inputs}x{args.outputs}, "
+            f"latency {args.latency} ms ± {args.jitter} ms, "
+            f"error rate {args.error_rate:.1%}, {args.transport} transport, "
+            f"JSON decoder {'orjson' if importlib.util.find_spec('orjson') else 'json'}"
+        )
+        try:
+            for single in (bench_poll_cycle, bench_confirm):
+                await single(bench, report)
+                await bench.close()
+            for count in args.fleet:
+                await bench_fleet(bench, report, count)
+                await bench.close()
+            if args.discovery:
+                await bench_discovery(bench, report, args.discovery)
+                await bench.close()
+        finally:
+            await bench.close()
+            with contextlib.suppress(Exception):
+                await hass.async_stop(force=True)
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inputs", type=int, default=4)
+    parser.add_argument("--outputs", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="ms per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0.0-1.0")
+    parser.add_argument("--transport", choices=("http", "tcp"), default="http")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--duration", type=float, default=3.0, help="seconds per fleet run"
+    )
+    parser.add_argument(
+        "--fleet", type=int, nargs="+", default=list(FLEET_SIZES),
+        help="fleet sizes to measure throughput for",
+    )
+    parser.add_argument(
+        "--discovery", type=int, default=5,
+        help="simulators to find in the discovery sweep (0 to skip)",
+    )
+    parser.add_argument("--output", help="also write the report to this file")
+    args = parser.parse_args()
+
+    # Failed requests are expected when --error-rate is set
+    logging.basicConfig(level=logging.CRITICAL)
+    lines: list[str] = []
+
+    def report(line: str) -> None:
+        print(line, flush=True)
+        lines.append(line)
+
+    asyncio.run(_run(args, report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""Local stand-in for the OREI matrix ``/cgi-bin/instr`` HTTP API.
+
+Serves the JSON commands the integration uses (``get status``, ``get video
+status``, ``get output status``, ``get input status``, ``video switch``,
+``set poweronoff``, ``preset set``/``preset save``) with configurable
+latency, jitter, error rate, matrix size and boot time, so the client and
+coordinator can be exercised without hardware. The ASCII telnet protocol used by the
+TCP transport can be served as well; route and power changes made through
+either protocol are pushed to every connected TCP client.
+
+Run standalone::
+
+    python -m benchmarks.simulator --size 8x8 --port 8080 --latency 20
+    python -m benchmarks.simulator --port 80 --tcp-port 23
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from typing import Any
+
+from aiohttp import web
+
+API_PATH = "/cgi-bin/instr"
+NUM_PRESETS = 8
+
+_ASCII_COMMANDS = (
+    (re.compile(r"s in (\d+) av out (\d+)"), "video switch"),
+    (re.compile(r"s power (\d)"), "set poweronoff"),
+    (re.compile(r"s recall preset (\d+)"), "preset set"),
+    (re.compile(r"s save preset (\d+)"), "preset save"),
+)
+
+
+class MatrixSimulator:
+    """One simulated matrix with its own HTTP server and state."""
+
+    def __init__(
+        self,
+        num_inputs: int = 4,
+        num_outputs: int = 4,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+        boot_delay: float = 0.0,
+    ) -> None:
+        """Create a matrix; latency, jitter and boot delay are in seconds.
+
+        Like the real device, a matrix switched on reports power on at once
+        but ignores routing, power and preset commands for ``boot_delay``.
+        """
+        self.num_inputs = num_inputs
+        self.num_outputs = num_outputs
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.boot_delay = boot_delay
+        self._random = random.Random(seed)
+
+        self.power = True
+        self._booted_at = 0.0
+        self.routing = [(out % num_inputs) + 1 for out in range(num_outputs)]
+        self.input_names = [f"input{i}" for i in range(1, num_inputs + 1)]
+        self.output_names = [f"hdmi output{o}" for o in range(1, num_outputs + 1)]
+        self.preset_names = [f"preset{p}" for p in range(1, NUM_PRESETS + 1)]
+        self.presets: list[list[int]] = [list(self.routing) for _ in self.preset_names]
+        self.input_active = [True] * num_inputs
+        self.output_connected = [True] * num_outputs
+        self.mac = ":".join(f"{self._random.randrange(256):02x}" for _ in range(6))
+
+        # Count of requests served, by comhead
+        self.requests: dict[str, int] = {}
+        self.host = "127.0.0.1"
+        self.port = 0
+        self.tcp_port = 0
+        self._runner: web.AppRunner | None = None
+        self._tcp_server: asyncio.Server | None = None
+        self._tcp_writers: set[asyncio.StreamWriter] = set()
+
+    @property
+    def booting(self) -> bool:
+        """Return True while the matrix is still booting."""
+        return time.monotonic() < self._booted_at
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests served so far."""
+        return sum(self.requests.values())
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start serving; returns the bound port (``port=0`` picks a free one)."""
+        app = web.Application()
+        app.router.add_post(API_PATH, self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.host = host
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Serve the ASCII protocol; returns the bound port."""
+        self._tcp_server = await asyncio.start_server(self._handle_tcp, host, port)
+        self.tcp_port = self._tcp_server.sockets[0].getsockname()[1]
+        return self.tcp_port
+
+    async def stop(self) -> None:
+        """Stop the HTTP and TCP servers."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._tcp_server is not None:
+            self._tcp_server.close()
+            for writer in list(self._tcp_writers):
+                writer.close()
+            await self._tcp_server.wait_closed()
+            self._tcp_server = None
+
+    def _push(self, line: str) -> None:
+        """Send a feedback line to every TCP client."""
+        for writer in list(self._tcp_writers):
+            writer.write(f"{line}\r\n".encode("ascii"))
+
+    async def _handle_tcp(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle one ASCII control connection.
+
+        Commands end with ``!``; replies are the same lines pushed as
+        feedback (e.g. ``input 2 -> output 1``), so a reply and the feedback
+        for it arrive as one line.
+        """
+        self._tcp_writers.add(writer)
+        try:
+            while data := await reader.readuntil(b"!"):
+                line = data.decode("ascii").strip(" \r\n!")
+                delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                for pattern, comhead in _ASCII_COMMANDS:
+                    if match := pattern.fullmatch(line):
+                        self.requests[comhead] = self.requests.get(comhead, 0) + 1
+                        args = [int(arg) for arg in match.groups()]
+                        try:
+                            self._ascii_command(comhead, args)
+                        except (KeyError, ValueError, IndexError):
+                            writer.write(b"command error\r\n")
+                        break
+                else:
+                    writer.write(b"command error\r\n")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._tcp_writers.discard(writer)
+            writer.close()
+
+    def _ascii_command(self, comhead: str, args: list[int]) -> None:
+        """Apply an ASCII command; its reply goes out as pushed feedback.
+
+        Raises ValueError for a command the matrix rejects, e.g. while it
+        boots.
+        """
+        if self.booting:
+            raise ValueError("booting")
+        if comhead == "video switch":
+            self.handle_command({"comhead": comhead, "source": args})
+        elif comhead == "set poweronoff":
+            self.handle_command({"comhead": comhead, "power": args[0]})
+        else:
+            self.handle_command({"comhead": comhead, "index": args[0]})
+            action = "recall" if comhead == "preset set" else "save"
+            self._push(f"{action} preset {args[0]}")
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        """Handle one ``/cgi-bin/instr`` POST."""
+        # The device ignores Content-Type, so parse the body regardless
+        payload = json.loads(await request.text())
+        comhead = payload.get("comhead", "")
+        self.requests[comhead] = self.requests.get(comhead, 0) + 1
+
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.Response(status=500, text="simulated error")
+
+        try:
+            body = self.handle_command(payload)
+        except (KeyError, ValueError, IndexError) as err:
+            return web.Response(status=400, text=f"bad request: {err}")
+        return web.json_response(body)
+
+    def handle_command(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Apply a command to the simulated state and build its response."""
+        comhead = payload.get("comhead", "")
+        power = int(self.power)
+        if self.booting and not comhead.startswith("get "):
+            # Accepted, but not acted upon
+            return {"comhead": comhead, "result": 1}
+
+        if comhead == "get status":
+            return {
+                "comhead": comhead,
+                "power": power,
+                "model": f"SIM-{self.num_inputs}x{self.num_outputs}",
+                "version": "sim-1.0",
+                "ip": self.host,
+                "mac": self.mac,
+            }
+        if comhead == "get video status":
+            return {
+                "comhead": comhead,
+                "power": power,
+                "allsource": [*self.routing, 0],
+                "allinputname": list(self.input_names),
+                "alloutputname": list(self.output_names),
+                "allname": list(self.preset_names),
+            }
+        if comhead == "get output status":
+            return {
+                "comhead": comhead,
+                "power": power,
+                "allconnect": [int(c) for c in self.output_connected],
+                "allhdbtconnect": [0] * self.num_outputs,
+                "allout": [1] * self.num_outputs,
+                "allscaler": [0] * self.num_outputs,
+                "allhdcp": [1] * self.num_outputs,
+            }
+        if comhead == "get input status":
+            return {
+                "comhead": comhead,
+                "power": power,
+                "inactive": [0 if active else 1 for active in self.input_active],
+                "edid": [1] * self.num_inputs,
+            }
+        if comhead == "video switch":
+            input_num, output_num = payload["source"]
+            if not 1 <= input_num <= self.num_inputs:
+                raise ValueError(f"input {input_num}")
+            self.routing[output_num - 1] = input_num
+            self._push(f"input {input_num} -> output {output_num}")
+            return {"comhead": comhead, "result": 1}
+        if comhead == "set poweronoff":
+            if payload["power"] and not self.power:
+                self._booted_at = time.monotonic() + self.boot_delay
+            self.power = bool(payload["power"])
+            self._push(f"power {'on' if self.power else 'off'}")
+            return {"comhead": comhead, "result": 1}
+        if comhead == "preset set":
+            self.routing = list(self.presets[payload["index"] - 1])
+            for output_num, input_num in enumerate(self.routing, 1):
+                self._push(f"input {input_num} -> output {output_num}")
+            return {"comhead": comhead, "result": 1}
+        if comhead == "preset save":
+            self.presets[payload["index"] - 1] = list(self.routing)
+            return {"comhead": comhead, "result": 1}
+        raise ValueError(f"unknown comhead {comhead!r}")
+
+
+def _parse_size(value: str) -> tuple[int, int]:
+    """Parse an ``INxOUT`` size such as ``8x8``."""
+    inputs, _, outputs = value.lower().partition("x")
+    return int(inputs), int(outputs or inputs)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run simulators until interrupted."""
+    num_inputs, num_outputs = _parse_size(args.size)
+    simulators = []
+    for idx in range(args.count):
+        sim = MatrixSimulator(
+            num_inputs,
+            num_outputs,
+            latency=args.latency / 1000,
+            jitter=args.jitter / 1000,
+            error_rate=args.error_rate,
+            boot_delay=args.boot_delay,
+        )
+        port = await sim.start(args.host, args.port + idx if args.port else 0)
+        print(f"OREI simulator {num_inputs}x{num_outputs} on http://{args.host}:{port}")
+        if args.tcp_port is not None:
+            tcp_port = await sim.start_tcp(
+                args.host, args.tcp_port + idx if args.tcp_port else 0
+            )
+            print(f"  ASCII control on {args.host}:{tcp_port}")
+        simulators.append(sim)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for sim in simulators:
+            await sim.stop()
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="first port (0 = any)")
+    parser.add_argument(
+        "--tcp-port", type=int, help="also serve ASCII control (0 = any)"
+    )
+    parser.add_argument("--count", type=int, default=1, help="number of matrices")
+    parser.add_argument("--size", default="4x4", help="inputs x outputs, e.g. 8x8")
+    parser.add_argument("--latency", type=float, default=0.0, help="ms per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="0.0-1.0")
+    parser.add_argument(
+        "--boot-delay", type=float, default=0.0, help="seconds to boot after power on"
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,45 @@
 """OREI HDMI Matrix integration for Home Assistant."""
 
-import json
 import logging
 from pathlib import Path
+from typing import Any
 
 from homeassistant.components.frontend import add_extra_js_url
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.storage import Store
+from homeassistant.loader import async_get_integration
 
 from .client import OreiMatrixClient
-from .const import DOMAIN, PLATFORMS
+from .const import (
+    CONF_KEEP_RAW,
+    CONF_SCAN_INTERVAL_INPUT,
+    CONF_SCAN_INTERVAL_OUTPUT,
+    CONF_SCAN_INTERVAL_VIDEO,
+    CONF_SIGNAL_DEBOUNCE,
+    CONF_SIGNAL_LOSS_DELAY,
+    CONF_SIGNAL_WRITE_INTERVAL,
+    CONF_TRANSPORT,
+    DEFAULT_PORT,
+    DEFAULT_TCP_PORT,
+    DOMAIN,
+    PLATFORMS,
+    SECTION_INPUT,
+    SECTION_OUTPUT,
+    SECTION_VIDEO,
+    SIGNAL_ENTRY_UNLOADED,
+    STORAGE_VERSION,
+    TRANSPORT_TCP,
+)
 from .coordinator import OreiMatrixCoordinator
+from .scheduler import async_get_scheduler
+from .services import async_setup_services
+from .signals import SignalFilter
+from .transport import HttpTransport, TcpTransport
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,9 +48,10 @@ CARD_URL = f"/{DOMAIN}/{CARD_JS}"
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
-    """Register the Lovelace card as a frontend resource."""
-    manifest = json.loads((Path(__file__).parent / "manifest.json").read_text())
-    version = manifest.get("version", "0")
+    """Register the Lovelace card, its websocket API and domain services."""
+    # The loader has already parsed manifest.json; no file I/O on the loop
+    integration = await async_get_integration(hass, DOMAIN)
+    version = str(integration.version or "0")
     versioned_url = f"{CARD_URL}?v={version}"
 
     # Serve the JS file at /orei_matrix/orei-matrix-card.js
@@ -40,6 +68,9 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     # Fallback: also inject via add_extra_js_url for immediate availability
     add_extra_js_url(hass, versioned_url)
 
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+
     return True
 
 
@@ -73,23 +104,84 @@ async def _register_card_resource(hass: HomeAssistant, url: str) -> None:
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up OREI Matrix from a config entry."""
     host = entry.data[CONF_HOST]
-    client = OreiMatrixClient(host)
-
-    coordinator = OreiMatrixCoordinator(hass, client)
-    await coordinator.async_config_entry_first_refresh()
+    scheduler = async_get_scheduler(hass)
+    transport = HttpTransport(host, DEFAULT_PORT)
+    if entry.data.get(CONF_TRANSPORT) == TRANSPORT_TCP:
+        transport = TcpTransport(host, DEFAULT_TCP_PORT, transport)
+    client = OreiMatrixClient(
+        host, limiter=scheduler.request_slot, transport=transport
+    )
+
+    scan_intervals = {
+        section: entry.options[key]
+        for section, key in (
+            (SECTION_VIDEO, CONF_SCAN_INTERVAL_VIDEO),
+            (SECTION_OUTPUT, CONF_SCAN_INTERVAL_OUTPUT),
+            (SECTION_INPUT, CONF_SCAN_INTERVAL_INPUT),
+        )
+        if key in entry.options
+    }
+    coordinator = OreiMatrixCoordinator(
+        hass,
+        client,
+        scan_intervals,
+        keep_raw=entry.options.get(CONF_KEEP_RAW, False),
+        store=_async_get_store(hass, entry.entry_id),
+        signal_filter=SignalFilter(
+            debounce=entry.options.get(CONF_SIGNAL_DEBOUNCE, 0),
+            loss_delay=entry.options.get(CONF_SIGNAL_LOSS_DELAY, 0),
+            write_interval=entry.options.get(CONF_SIGNAL_WRITE_INTERVAL, 0),
+        ),
+    )
+    # With a saved state, entities come up from it (marked stale) and the
+    # first poll runs in the background; otherwise the device's layout is
+    # needed before the entities can be created.
+    restored = await coordinator.async_restore()
+    if not restored:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await client.async_close()
+            raise
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "client": client,
         "coordinator": coordinator,
     }
+    scheduler.async_register(entry.entry_id, coordinator)
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {host}"
+        )
     return True
 
 
+def _async_get_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store holding an entry's last-known matrix state."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload OREI Matrix config entry."""
     unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unloaded:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        async_get_scheduler(hass).async_unregister(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        async_dispatcher_send(hass, SIGNAL_ENTRY_UNLOADED.format(entry.entry_id))
+        await data["coordinator"].async_shutdown()
+        await data["client"].async_close()
     return unloaded
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the saved state of a removed entry."""
+    await _async_get_store(hass, entry.entry_id).async_remove()
@@ -7,12 +7,13 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, NUM_INPUTS, NUM_OUTPUTS
+from .const import DOMAIN, SECTION_INPUT, SECTION_OUTPUT
 from .coordinator import OreiMatrixCoordinator
+from .entity import OreiMatrixEntity, get_output_name
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,46 +28,38 @@ async def async_setup_entry(
     entities: list[BinarySensorEntity] = []
 
     # Input signal sensors
-    for i in range(1, NUM_INPUTS + 1):
+    for i in range(1, coordinator.num_inputs + 1):
         name = _get_input_name(coordinator, i, f"Input {i}")
         entities.append(
             OreiMatrixInputSignal(coordinator, entry, i, f"{name} Signal")
         )
 
     # Output connection sensors
-    for i in range(1, NUM_OUTPUTS + 1):
-        name = _get_output_name(coordinator, i, f"Output {i}")
+    for i in range(1, coordinator.num_outputs + 1):
+        name = get_output_name(coordinator, i, f"Output {i}")
         entities.append(
             OreiMatrixOutputSignal(coordinator, entry, i, f"{name} Connected")
         )
+        entities.append(
+            OreiMatrixOutputStream(coordinator, entry, i, f"{name} Stream")
+        )
 
     async_add_entities(entities)
 
 
 def _get_input_name(coordinator, input_num, default):
     if coordinator.data:
-        names = coordinator.data.get("input_names", {})
-        if input_num in names and names[input_num]:
-            return names[input_num]
-    return default
-
-
-def _get_output_name(coordinator, output_num, default):
-    if coordinator.data:
-        names = coordinator.data.get("output_names", {})
-        name = names.get(output_num, "")
-        if name and not name.lower().startswith("hdmi output"):
+        name = coordinator.data.input_name(input_num)
+        if name:
             return name
     return default
 
 
-class OreiMatrixInputSignal(
-    CoordinatorEntity[OreiMatrixCoordinator], BinarySensorEntity
-):
+class OreiMatrixInputSignal(OreiMatrixEntity, BinarySensorEntity):
     """Binary sensor for input active signal detection."""
 
-    _attr_has_entity_name = True
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _sections = (SECTION_INPUT,)
 
     def __init__(
         self,
@@ -75,35 +68,23 @@ class OreiMatrixInputSignal(
         input_num: int,
         name: str,
     ) -> None:
-        super().__init__(coordinator)
-        self._entry = entry
+        super().__init__(coordinator, entry, (("input_active", input_num),))
         self._input_num = input_num
         self._attr_name = name
         self._attr_unique_id = f"{entry.entry_id}_input_{input_num}_signal"
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": self._entry.title,
-            "manufacturer": "OREI",
-            "configuration_url": f"http://{self._entry.data['host']}",
-        }
-
     @property
     def is_on(self) -> bool | None:
         if self.coordinator.data is None:
             return None
-        return self.coordinator.data.get("input_active", {}).get(self._input_num)
+        return self.coordinator.data.is_input_active(self._input_num)
 
 
-class OreiMatrixOutputSignal(
-    CoordinatorEntity[OreiMatrixCoordinator], BinarySensorEntity
-):
+class OreiMatrixOutputSignal(OreiMatrixEntity, BinarySensorEntity):
     """Binary sensor for output connection status."""
 
-    _attr_has_entity_name = True
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _sections = (SECTION_OUTPUT,)
 
     def __init__(
         self,
@@ -112,23 +93,44 @@ class OreiMatrixOutputSignal(
         output_num: int,
         name: str,
     ) -> None:
-        super().__init__(coordinator)
-        self._entry = entry
+        super().__init__(coordinator, entry, (("output_connected", output_num),))
         self._output_num = output_num
         self._attr_name = name
         self._attr_unique_id = f"{entry.entry_id}_output_{output_num}_signal"
 
     @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": self._entry.title,
-            "manufacturer": "OREI",
-            "configuration_url": f"http://{self._entry.data['host']}",
-        }
+    def is_on(self) -> bool | None:
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.is_output_connected(self._output_num)
+
+
+class OreiMatrixOutputStream(OreiMatrixEntity, BinarySensorEntity):
+    """Binary sensor for whether an output's stream is enabled.
+
+    Disabled by default: output status is only polled while an entity that
+    uses it is enabled.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:video-outline"
+    _sections = (SECTION_OUTPUT,)
+
+    def __init__(
+        self,
+        coordinator: OreiMatrixCoordinator,
+        entry: ConfigEntry,
+        output_num: int,
+        name: str,
+    ) -> None:
+        super().__init__(coordinator, entry, (("output_stream", output_num),))
+        self._output_num = output_num
+        self._attr_name = name
+        self._attr_unique_id = f"{entry.entry_id}_output_{output_num}_stream"
 
     @property
     def is_on(self) -> bool | None:
         if self.coordinator.data is None:
             return None
-        return self.coordinator.data.get("output_connected", {}).get(self._output_num)
+        return self.coordinator.data.port_value("output_stream", self._output_num)
@@ -0,0 +1,63 @@
+"""Preset recall buttons for the OREI Matrix integration."""
+
+import logging
+
+from homeassistant.components.button import ButtonEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, SECTION_VIDEO
+from .coordinator import OreiMatrixCoordinator
+from .entity import OreiMatrixEntity
+from .services import async_recall_preset
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up one recall button per preset reported by the matrix."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: OreiMatrixCoordinator = data["coordinator"]
+
+    preset_names = coordinator.data.preset_names if coordinator.data else ()
+    async_add_entities(
+        OreiMatrixPresetButton(coordinator, entry, num, name or f"Preset {num}")
+        for num, name in enumerate(preset_names, start=1)
+    )
+
+
+class OreiMatrixPresetButton(OreiMatrixEntity, ButtonEntity):
+    """Button that recalls one of the matrix's stored routing presets."""
+
+    _attr_icon = "mdi:television-guide"
+    _sections = (SECTION_VIDEO,)
+    # Fixed per entity; not worth a copy in every recorded state
+    _unrecorded_attributes = frozenset({"preset_number"})
+
+    def __init__(
+        self,
+        coordinator: OreiMatrixCoordinator,
+        entry: ConfigEntry,
+        preset_num: int,
+        name: str,
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._preset_num = preset_num
+        self._attr_name = name
+        self._attr_unique_id = f"{entry.entry_id}_preset_{preset_num}"
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Expose the preset slot so the card can find the button."""
+        attrs = {"preset_number": self._preset_num}
+        if self.stale:
+            attrs["stale"] = True
+        return attrs
+
+    async def async_press(self) -> None:
+        """Recall the preset on the device."""
+        _LOGGER.debug("Recalling preset %d", self._preset_num)
+        await async_recall_preset(self.coordinator, self._preset_num)
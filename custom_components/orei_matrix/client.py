@@ -1,58 +1,394 @@
-"""Async HTTP client for OREI UHD44-EXB400R-K matrix switcher."""
+"""Async client for OREI UHD44-EXB400R-K matrix switcher."""
 
 import asyncio
+import itertools
 import logging
+import time
+from collections.abc import Callable, Hashable
+from contextlib import AbstractAsyncContextManager, nullcontext
 from typing import Any
 
 import aiohttp
 
-from .const import API_PATH, REQUEST_TIMEOUT
+from .const import CIRCUIT_FAILURE_THRESHOLD, PROBE_INITIAL_DELAY, PROBE_MAX_DELAY
+from .stats import RequestStats
+from .transport import FeedbackListener, HttpTransport, OreiMatrixTransport
 
 _LOGGER = logging.getLogger(__name__)
 
+# Queue priorities: lower is sent first
+PRIORITY_COMMAND = 0
+PRIORITY_POLL = 1
+
+
+class MatrixOfflineError(ConnectionError):
+    """Raised without contacting the device while it is known to be offline."""
+
+
+class _Job:
+    """A queued device request, shared by every caller coalesced into it."""
+
+    __slots__ = ("counted", "future", "if_changed", "key", "payload", "queued_at")
+
+    def __init__(
+        self,
+        payload: dict[str, Any],
+        future: asyncio.Future,
+        key: Hashable | None,
+        counted: bool = True,
+        if_changed: bool = False,
+    ) -> None:
+        self.payload = payload
+        self.future = future
+        self.key = key
+        self.queued_at = time.monotonic()
+        # Whether a connection failure counts towards the circuit breaker
+        self.counted = counted
+        # Whether an unchanged answer may be returned as UNCHANGED
+        self.if_changed = if_changed
+
 
 class OreiMatrixClient:
-    """HTTP client for the OREI matrix CGI API."""
+    """Client for the OREI matrix CGI API.
 
-    def __init__(self, host: str, port: int = 80) -> None:
+    Requests are carried by a transport (see :mod:`.transport`). By default
+    that is an :class:`HttpTransport` holding one long-lived ``aiohttp``
+    session, so polls and commands reuse keep-alive connections; pass
+    ``session`` to share an existing session (e.g. Home Assistant's), or
+    ``transport`` to use another one such as :class:`TcpTransport`.
+
+    The embedded CGI server misbehaves under concurrent requests, so all
+    device traffic goes through a single-consumer priority queue: one request
+    is in flight at a time and commands jump ahead of queued polls (a
+    pipelined transport sends queued requests without waiting). Queued
+    requests with the same coalescing key (e.g. ``video switch`` for one
+    output, or a repeated poll) are merged — only the latest payload is sent
+    and every caller receives its result.
+
+    ``limiter`` is an optional async context manager factory (e.g. the fleet
+    scheduler's ``request_slot``) held around every device request.
+
+    Latency, queue wait and failures are recorded per ``comhead`` in
+    :attr:`stats`.
+
+    A circuit breaker stops the client from waiting out timeouts against a
+    device that is powered off: after ``CIRCUIT_FAILURE_THRESHOLD``
+    consecutive connection failures every request fails at once with
+    :class:`MatrixOfflineError`, and a background probe retries ``get
+    status`` with exponential backoff. Connection listeners are told when
+    the device goes offline and when it comes back.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 80,
+        session: aiohttp.ClientSession | None = None,
+        limiter: Callable[[], AbstractAsyncContextManager[Any]] | None = None,
+        transport: OreiMatrixTransport | None = None,
+    ) -> None:
         self._host = host
-        self._port = port
-        self._base_url = f"http://{host}:{port}{API_PATH}"
+        self._transport = transport or HttpTransport(host, port, session)
+        self._transport.feedback_listener = self._handle_feedback
+        self._queue: asyncio.PriorityQueue[tuple[int, int, _Job]] = (
+            asyncio.PriorityQueue()
+        )
+        self._queued: dict[Hashable, _Job] = {}
+        self._seq = itertools.count()
+        self._worker: asyncio.Task | None = None
+        self._limiter = limiter or nullcontext
+        self.stats: dict[str, RequestStats] = {}
+        self._failures = 0
+        self._offline = False
+        self._probe: asyncio.Task | None = None
+        self._connection_listeners: list[Callable[[bool], None]] = []
+        self._feedback_listeners: list[FeedbackListener] = []
+        self._in_flight: set[asyncio.Task] = set()
+        # Jobs taken off the queue whose callers are still waiting
+        self._sending: set[_Job] = set()
+
+    @property
+    def host(self) -> str:
+        """Return the matrix host."""
+        return self._host
+
+    async def async_close(self) -> None:
+        """Stop the request queue and close the transport."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._probe is not None:
+            self._probe.cancel()
+            self._probe = None
+        for task in self._in_flight:
+            task.cancel()
+        err = ConnectionError(f"Client for {self._host} closed")
+        # Requests being sent were cancelled with the worker; their callers
+        # would otherwise wait forever
+        for job in list(self._sending):
+            if not job.future.done():
+                job.future.set_exception(err)
+        self._sending.clear()
+        self._fail_queued(err)
+        await self._transport.close()
+
+    def _fail_queued(self, err: Exception) -> None:
+        """Fail every request that has not been sent yet."""
+        while not self._queue.empty():
+            _, _, job = self._queue.get_nowait()
+            if not job.future.done():
+                job.future.set_exception(err)
+        self._queued.clear()
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting to be sent."""
+        return self._queue.qsize()
+
+    @property
+    def offline(self) -> bool:
+        """Return True while the circuit breaker treats the device as down."""
+        return self._offline
+
+    def add_connection_listener(
+        self, listener: Callable[[bool], None]
+    ) -> Callable[[], None]:
+        """Call ``listener(online)`` when the device goes offline or recovers.
+
+        Returns a function that removes the listener.
+        """
+        self._connection_listeners.append(listener)
+        return lambda: self._connection_listeners.remove(listener)
+
+    def add_feedback_listener(self, listener: FeedbackListener) -> Callable[[], None]:
+        """Call ``listener(kind, value)`` for state changes the device pushes.
+
+        Only pushing transports report feedback. Returns a function that
+        removes the listener.
+        """
+        self._feedback_listeners.append(listener)
+        return lambda: self._feedback_listeners.remove(listener)
+
+    def _handle_feedback(self, kind: str, value: Any) -> None:
+        """Forward feedback from the transport to listeners."""
+        for listener in list(self._feedback_listeners):
+            listener(kind, value)
+
+    def _set_offline(self, offline: bool) -> None:
+        """Open or close the circuit breaker and notify listeners."""
+        self._offline = offline
+        for listener in list(self._connection_listeners):
+            listener(not offline)
+
+    def _connection_failed(self, err: Exception) -> None:
+        """Count a connection failure, opening the breaker at the threshold."""
+        self._failures += 1
+        if self._offline:
+            _LOGGER.debug("OREI matrix %s still unreachable: %s", self._host, err)
+            return
+        if self._failures < CIRCUIT_FAILURE_THRESHOLD:
+            _LOGGER.debug("Connection to OREI matrix %s failed: %s", self._host, err)
+            return
+        _LOGGER.warning(
+            "OREI matrix %s is unreachable (%s); failing fast and retrying "
+            "in the background",
+            self._host, str(err) or type(err).__name__,
+        )
+        self._set_offline(True)
+        self._fail_queued(MatrixOfflineError(f"OREI matrix {self._host} is offline"))
+        self._probe = asyncio.get_running_loop().create_task(
+            self._probe_until_online(), name=f"orei_matrix probe {self._host}"
+        )
+
+    def _connection_succeeded(self) -> None:
+        """Reset the failure count, closing the breaker if it was open."""
+        self._failures = 0
+        if self._offline:
+            _LOGGER.info("OREI matrix %s is reachable again", self._host)
+            self._set_offline(False)
 
-    async def _request(self, payload: dict[str, Any]) -> dict[str, Any]:
-        """Send a POST request to the matrix API and return JSON response."""
-        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async def _probe_until_online(self) -> None:
+        """Retry ``get status`` with exponential backoff until it succeeds."""
+        delay = PROBE_INITIAL_DELAY
+        while self._offline:
+            await asyncio.sleep(delay)
+            try:
+                async with self._limiter():
+                    await self._send({"comhead": "get status", "language": 0})
+            except ConnectionError:
+                delay = min(delay * 2, PROBE_MAX_DELAY)
+        self._probe = None
+
+    async def _request(
+        self,
+        payload: dict[str, Any],
+        *,
+        priority: int = PRIORITY_POLL,
+        key: Hashable | None = None,
+        counted: bool = True,
+        if_changed: bool = False,
+    ) -> dict[str, Any]:
+        """Queue a request for the device and wait for its JSON response.
+
+        With ``counted`` False, failing to reach the device does not count
+        towards the circuit breaker (unless a coalesced caller counts it).
+        With ``if_changed``, an answer identical to the last one is returned
+        as ``UNCHANGED`` (unless a coalesced caller needs it in full).
+        """
+        if self._offline:
+            raise MatrixOfflineError(f"OREI matrix {self._host} is offline")
+        if key is not None and (job := self._queued.get(key)) is not None:
+            # Not sent yet: replace its payload, last one wins
+            job.payload = payload
+            job.counted = job.counted or counted
+            job.if_changed = job.if_changed and if_changed
+            _LOGGER.debug("Coalesced %s into queued request", payload.get("comhead"))
+        else:
+            future = asyncio.get_running_loop().create_future()
+            # Consume the exception if every waiter has been cancelled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            job = _Job(payload, future, key, counted, if_changed)
+            if key is not None:
+                self._queued[key] = job
+            self._queue.put_nowait((priority, next(self._seq), job))
+            if self._worker is None or self._worker.done():
+                self._worker = asyncio.get_running_loop().create_task(
+                    self._process_queue(), name=f"orei_matrix queue {self._host}"
+                )
+        # Shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(job.future)
+
+    async def _process_queue(self) -> None:
+        """Send queued requests to the device until drained.
+
+        Requests are sent one at a time, or without waiting for replies if
+        the transport is pipelined (each still holds a limiter slot).
+        """
+        while not self._queue.empty():
+            if self._transport.pipelined:
+                if (job := self._dequeue()) is not None:
+                    task = asyncio.get_running_loop().create_task(
+                        self._run_job(job, limited=True)
+                    )
+                    self._in_flight.add(task)
+                    task.add_done_callback(self._in_flight.discard)
+                continue
+            # Wait for a slot before dequeuing so the job can still be
+            # coalesced or overtaken by a command in the meantime
+            async with self._limiter():
+                if (job := self._dequeue()) is not None:
+                    await self._run_job(job)
+
+    def _dequeue(self) -> _Job | None:
+        """Take the next pending job off the queue, if any."""
+        while not self._queue.empty():
+            _, _, job = self._queue.get_nowait()
+            if job.key is not None and self._queued.get(job.key) is job:
+                del self._queued[job.key]
+            if not job.future.done():
+                self._sending.add(job)
+                job.future.add_done_callback(
+                    lambda _, job=job: self._sending.discard(job)
+                )
+                return job
+        return None
+
+    async def _run_job(self, job: _Job, limited: bool = False) -> None:
+        """Send a job's request and hand the outcome to its callers."""
+        async with self._limiter() if limited else nullcontext():
+            self._stats(job.payload).queue_wait.append(
+                time.monotonic() - job.queued_at
+            )
+            try:
+                result = await self._send(
+                    job.payload, counted=job.counted, if_changed=job.if_changed
+                )
+            except Exception as err:  # noqa: BLE001 - handed to the caller
+                if not job.future.done():
+                    job.future.set_exception(err)
+            else:
+                if not job.future.done():
+                    job.future.set_result(result)
+
+    def _stats(self, payload: dict[str, Any]) -> RequestStats:
+        """Return the statistics for a request's ``comhead``."""
+        comhead = payload.get("comhead", "")
+        if (stats := self.stats.get(comhead)) is None:
+            stats = self.stats[comhead] = RequestStats()
+        return stats
+
+    async def _send(
+        self, payload: dict[str, Any], counted: bool = True, if_changed: bool = False
+    ) -> dict[str, Any]:
+        """Send a request over the transport and return the JSON response.
+
+        Connection failures count towards the circuit breaker if ``counted``.
+        """
+        stats = self._stats(payload)
+        start = time.monotonic()
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(self._base_url, json=payload) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json(content_type=None)
-                    _LOGGER.debug("API %s -> %s", payload.get("comhead"), data)
-                    return data
+            result = await self._transport.request(payload, if_changed)
         except asyncio.TimeoutError as err:
-            _LOGGER.error("Timeout connecting to OREI matrix at %s", self._host)
+            stats.record(time.monotonic() - start, err, timeout=True)
+            if counted:
+                self._connection_failed(err)
             raise ConnectionError(f"Timeout connecting to {self._host}") from err
+        except (aiohttp.ClientConnectionError, OSError) as err:
+            stats.record(time.monotonic() - start, err)
+            if counted:
+                self._connection_failed(err)
+            raise ConnectionError(f"Cannot connect to {self._host}: {err}") from err
         except aiohttp.ClientError as err:
+            # The device answered, so it is up; this is not a connection failure
+            stats.record(time.monotonic() - start, err)
+            self._connection_succeeded()
             _LOGGER.error("Error connecting to OREI matrix at %s: %s", self._host, err)
             raise ConnectionError(f"Cannot connect to {self._host}: {err}") from err
+        stats.record(time.monotonic() - start)
+        self._connection_succeeded()
+        return result
 
     # ── Status queries ──────────────────────────────────────────────
 
-    async def get_status(self) -> dict[str, Any]:
-        """Get device info: model, firmware, IP, MAC."""
-        return await self._request({"comhead": "get status", "language": 0})
+    async def get_status(self, counted: bool = True) -> dict[str, Any]:
+        """Get device info: model, firmware, IP, MAC.
 
-    async def get_video_status(self) -> dict[str, Any]:
+        Pass ``counted=False`` while the device is expected not to answer
+        (e.g. booting), so that does not open the circuit breaker.
+        """
+        return await self._request(
+            {"comhead": "get status", "language": 0},
+            key="get status",
+            counted=counted,
+        )
+
+    async def get_video_status(self, if_changed: bool = False) -> dict[str, Any]:
         """Get routing map, input/output names, preset names, power state."""
-        return await self._request({"comhead": "get video status", "language": 0})
+        return await self._request(
+            {"comhead": "get video status", "language": 0},
+            key="get video status",
+            if_changed=if_changed,
+        )
 
-    async def get_output_status(self) -> dict[str, Any]:
+    async def get_output_status(self, if_changed: bool = False) -> dict[str, Any]:
         """Get output signal detection, stream enables, scaler, HDCP."""
-        return await self._request({"comhead": "get output status", "language": 0})
+        return await self._request(
+            {"comhead": "get output status", "language": 0},
+            key="get output status",
+            if_changed=if_changed,
+        )
 
-    async def get_input_status(self) -> dict[str, Any]:
+    async def get_input_status(self, if_changed: bool = False) -> dict[str, Any]:
         """Get input EDID and active signal info."""
-        return await self._request({"comhead": "get input status", "language": 0})
+        return await self._request(
+            {"comhead": "get input status", "language": 0},
+            key="get input status",
+            if_changed=if_changed,
+        )
+
+    def forget_response(self, comhead: str) -> None:
+        """Return the next ``if_changed`` answer for ``comhead`` in full."""
+        self._transport.forget(comhead)
 
     # ── Commands ────────────────────────────────────────────────────
 
@@ -60,25 +396,63 @@ class OreiMatrixClient:
         """Route an input to an output.
 
         Args:
-            input_num: 1-based input number (1-4).
-            output_num: 1-based output number (1-8, where 1-4=HDMI, 5-8=HDBaseT).
+            input_num: 1-based input number (1-4 on a 4x4 unit).
+            output_num: 1-based output number (1-8 on a 4x4 unit, where
+                1-4=HDMI, 5-8=HDBaseT; larger frames report more outputs).
         """
-        return await self._request({
-            "comhead": "video switch",
-            "language": 0,
-            "source": [input_num, output_num],
-        })
+        return await self._request(
+            {
+                "comhead": "video switch",
+                "language": 0,
+                "source": [input_num, output_num],
+            },
+            priority=PRIORITY_COMMAND,
+            key=("video switch", output_num),
+        )
 
     async def set_power(self, on: bool) -> dict[str, Any]:
         """Turn matrix power on (1) or off (0)."""
-        return await self._request({
-            "comhead": "set poweronoff",
-            "language": 0,
-            "power": 1 if on else 0,
-        })
+        return await self._request(
+            {
+                "comhead": "set poweronoff",
+                "language": 0,
+                "power": 1 if on else 0,
+            },
+            priority=PRIORITY_COMMAND,
+            key="set poweronoff",
+        )
+
+    async def preset_recall(self, preset: int) -> dict[str, Any]:
+        """Recall a preset stored on the matrix (applies its full routing).
+
+        Args:
+            preset: 1-based preset number.
+        """
+        return await self._request(
+            {"comhead": "preset set", "language": 0, "index": preset},
+            priority=PRIORITY_COMMAND,
+            key="preset set",
+        )
+
+    async def preset_save(self, preset: int) -> dict[str, Any]:
+        """Save the current routing into a preset slot on the matrix.
+
+        Args:
+            preset: 1-based preset number.
+        """
+        return await self._request(
+            {"comhead": "preset save", "language": 0, "index": preset},
+            priority=PRIORITY_COMMAND,
+            key=("preset save", preset),
+        )
 
     # ── Validation ──────────────────────────────────────────────────
 
     async def validate_connection(self) -> dict[str, Any]:
         """Test connectivity and return device status. Raises on failure."""
-        return await self.get_status()
+        status = await self.get_status()
+        try:
+            await self._transport.validate()
+        except (OSError, TimeoutError) as err:
+            raise ConnectionError(f"Cannot connect to {self._host}: {err}") from err
+        return status
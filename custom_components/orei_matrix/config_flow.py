@@ -1,19 +1,50 @@
 """Config flow for OREI Matrix integration."""
 
+import ipaddress
 import logging
 
 import voluptuous as vol
-
 from homeassistant import config_entries
+from homeassistant.components import network
 from homeassistant.const import CONF_HOST
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .client import OreiMatrixClient
-from .const import DOMAIN
+from .const import (
+    CONF_HOSTS,
+    CONF_KEEP_RAW,
+    CONF_SCAN_INTERVAL_INPUT,
+    CONF_SCAN_INTERVAL_OUTPUT,
+    CONF_SCAN_INTERVAL_VIDEO,
+    CONF_SIGNAL_DEBOUNCE,
+    CONF_SIGNAL_LOSS_DELAY,
+    CONF_SIGNAL_WRITE_INTERVAL,
+    CONF_SUBNET,
+    CONF_TRANSPORT,
+    DEFAULT_PORT,
+    DEFAULT_SCAN_INTERVAL_INPUT,
+    DEFAULT_SCAN_INTERVAL_OUTPUT,
+    DEFAULT_SCAN_INTERVAL_VIDEO,
+    DEFAULT_TCP_PORT,
+    DOMAIN,
+    MAX_SCAN_INTERVAL,
+    MAX_SIGNAL_DELAY,
+    MIN_SCAN_INTERVAL,
+    TRANSPORT_HTTP,
+    TRANSPORT_TCP,
+)
+from .discovery import DiscoveredMatrix, async_discover, parse_hosts
+from .transport import HttpTransport, TcpTransport
 
 _LOGGER = logging.getLogger(__name__)
 
+TRANSPORT_SCHEMA = vol.In([TRANSPORT_HTTP, TRANSPORT_TCP])
+
 DATA_SCHEMA = vol.Schema({
     vol.Required(CONF_HOST): str,
+    vol.Required(CONF_TRANSPORT, default=TRANSPORT_HTTP): TRANSPORT_SCHEMA,
 })
 
 
@@ -22,8 +53,25 @@ class OreiMatrixConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow handler."""
+        return OreiMatrixOptionsFlow()
+
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._discovered: dict[str, DiscoveredMatrix] = {}
+
     async def async_step_user(self, user_input=None):
-        """Handle the initial step — user enters host IP."""
+        """Handle the initial step — enter a host or search the network."""
+        if user_input is not None:
+            # Another matrix picked in the same scan: see async_step_scan_select
+            return await self._async_add_scanned(user_input)
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+
+    async def async_step_manual(self, user_input=None):
+        """Handle a host IP and transport entered by the user."""
         errors = {}
 
         if user_input is not None:
@@ -33,25 +81,159 @@ class OreiMatrixConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             await self.async_set_unique_id(host)
             self._abort_if_unique_id_configured()
 
-            # Validate connection
-            client = OreiMatrixClient(host)
             try:
-                status = await client.validate_connection()
-                model = status.get("model", status.get("type", "OREI Matrix"))
-                title = f"OREI {model} ({host})"
+                title = await self._async_validate(host, user_input[CONF_TRANSPORT])
             except ConnectionError:
                 errors["base"] = "cannot_connect"
             except Exception:
                 _LOGGER.exception("Unexpected error during config flow")
                 errors["base"] = "unknown"
+            if not errors:
+                return self._async_create(host, user_input[CONF_TRANSPORT], title)
+
+        return self.async_show_form(
+            step_id="manual",
+            data_schema=DATA_SCHEMA,
+            errors=errors,
+        )
+
+    async def async_step_scan(self, user_input=None):
+        """Probe a subnet or address range for matrices."""
+        errors = {}
+
+        if user_input is not None:
+            try:
+                hosts = parse_hosts(user_input[CONF_SUBNET])
+            except ValueError:
+                errors[CONF_SUBNET] = "invalid_range"
             else:
-                return self.async_create_entry(
-                    title=title,
-                    data={CONF_HOST: host},
+                configured = self._async_current_ids()
+                found = await async_discover(async_get_clientsession(self.hass), hosts)
+                self._discovered = {
+                    matrix.host: matrix
+                    for matrix in found
+                    if matrix.host not in configured
+                }
+                if self._discovered:
+                    return await self.async_step_scan_select()
+                errors["base"] = "no_devices_found"
+
+        subnet = (user_input or {}).get(CONF_SUBNET) or await self._async_local_subnet()
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=vol.Schema({vol.Required(CONF_SUBNET, default=subnet): str}),
+            errors=errors,
+        )
+
+    async def async_step_scan_select(self, user_input=None):
+        """Let the user pick which of the discovered matrices to add."""
+        errors = {}
+
+        if user_input is not None and not user_input[CONF_HOSTS]:
+            errors[CONF_HOSTS] = "no_selection"
+        elif user_input is not None:
+            host, *others = user_input[CONF_HOSTS]
+            transport = user_input[CONF_TRANSPORT]
+            # One flow creates one entry; add the others through their own
+            for other in others:
+                self.hass.async_create_task(
+                    self.hass.config_entries.flow.async_init(
+                        DOMAIN,
+                        context={"source": config_entries.SOURCE_USER},
+                        data={CONF_HOST: other, CONF_TRANSPORT: transport},
+                    )
                 )
+            return await self._async_add_scanned(
+                {CONF_HOST: host, CONF_TRANSPORT: transport}
+            )
 
+        hosts = {host: matrix.label for host, matrix in self._discovered.items()}
         return self.async_show_form(
-            step_id="user",
-            data_schema=DATA_SCHEMA,
+            step_id="scan_select",
+            data_schema=vol.Schema({
+                vol.Required(CONF_HOSTS, default=list(hosts)): cv.multi_select(hosts),
+                vol.Required(CONF_TRANSPORT, default=TRANSPORT_HTTP): TRANSPORT_SCHEMA,
+            }),
             errors=errors,
+            description_placeholders={"count": str(len(hosts))},
+        )
+
+    async def _async_add_scanned(self, data):
+        """Add a matrix picked in a network scan without asking again."""
+        host = data[CONF_HOST]
+        await self.async_set_unique_id(host)
+        self._abort_if_unique_id_configured()
+        try:
+            title = await self._async_validate(host, data[CONF_TRANSPORT])
+        except ConnectionError:
+            return self.async_abort(reason="cannot_connect")
+        except Exception:
+            _LOGGER.exception("Unexpected error adding %s", host)
+            return self.async_abort(reason="unknown")
+        return self._async_create(host, data[CONF_TRANSPORT], title)
+
+    async def _async_validate(self, host: str, transport_type: str) -> str:
+        """Connect to a matrix (and its TCP port, if chosen); return a title."""
+        transport = HttpTransport(
+            host, DEFAULT_PORT, async_get_clientsession(self.hass)
+        )
+        if transport_type == TRANSPORT_TCP:
+            transport = TcpTransport(host, DEFAULT_TCP_PORT, transport)
+        client = OreiMatrixClient(host, transport=transport)
+        try:
+            status = await client.validate_connection()
+        finally:
+            await client.async_close()
+        model = status.get("model", status.get("type", "OREI Matrix"))
+        return f"OREI {model} ({host})"
+
+    @callback
+    def _async_create(self, host: str, transport_type: str, title: str):
+        """Create the config entry for a validated matrix."""
+        return self.async_create_entry(
+            title=title,
+            data={CONF_HOST: host, CONF_TRANSPORT: transport_type},
+        )
+
+    async def _async_local_subnet(self) -> str:
+        """Return the /24 around Home Assistant's own address, or ""."""
+        try:
+            source_ip = await network.async_get_source_ip(self.hass)
+        except Exception:  # noqa: BLE001 - only a form default
+            return ""
+        return str(ipaddress.ip_network(f"{source_ip}/24", strict=False))
+
+
+class OreiMatrixOptionsFlow(config_entries.OptionsFlow):
+    """Handle OREI Matrix options — polling, signal debounce and debugging."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the polling intervals, signal debounce and debug options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        interval = vol.All(
+            vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL)
         )
+        delay = vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_SIGNAL_DELAY))
+        schema = vol.Schema({
+            vol.Required(key, default=options.get(key, default)): interval
+            for key, default in (
+                (CONF_SCAN_INTERVAL_VIDEO, DEFAULT_SCAN_INTERVAL_VIDEO),
+                (CONF_SCAN_INTERVAL_OUTPUT, DEFAULT_SCAN_INTERVAL_OUTPUT),
+                (CONF_SCAN_INTERVAL_INPUT, DEFAULT_SCAN_INTERVAL_INPUT),
+            )
+        }).extend({
+            vol.Optional(key, default=options.get(key, 0)): delay
+            for key in (
+                CONF_SIGNAL_DEBOUNCE,
+                CONF_SIGNAL_LOSS_DELAY,
+                CONF_SIGNAL_WRITE_INTERVAL,
+            )
+        }).extend({
+            vol.Optional(
+                CONF_KEEP_RAW, default=options.get(CONF_KEEP_RAW, False)
+            ): bool,
+        })
+        return self.async_show_form(step_id="init", data_schema=schema)
@@ -2,17 +2,130 @@
 
 DOMAIN = "orei_matrix"
 
+# hass.data key for the fleet-wide poll scheduler shared by all entries
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
 CONF_HOST = "host"
 
 DEFAULT_PORT = 80
-DEFAULT_SCAN_INTERVAL = 15
 REQUEST_TIMEOUT = 5
 
+# HTTP connection pool: the embedded CGI server only copes with a couple of
+# sockets, so keep a small pool of keep-alive connections per client.
+CONNECTION_LIMIT = 2
+KEEPALIVE_TIMEOUT = 30
+
 API_PATH = "/cgi-bin/instr"
 
-# Number of inputs/outputs
-NUM_INPUTS = 4
-NUM_OUTPUTS = 4
+# Control transport, chosen in the config flow: HTTP CGI only, or commands and
+# pushed feedback over a persistent TCP (telnet) ASCII connection
+CONF_TRANSPORT = "transport"
+TRANSPORT_HTTP = "http"
+TRANSPORT_TCP = "tcp"
+DEFAULT_TCP_PORT = 23
+
+# Circuit breaker: after this many consecutive connection failures the device
+# is treated as offline. Requests then fail at once while a background probe
+# retries with exponential backoff, from PROBE_INITIAL_DELAY to PROBE_MAX_DELAY.
+CIRCUIT_FAILURE_THRESHOLD = 2
+PROBE_INITIAL_DELAY = 5
+PROBE_MAX_DELAY = 60
+
+# Status sections, one per polled endpoint
+SECTION_VIDEO = "video"  # get video status: power, routing, names
+SECTION_OUTPUT = "output"  # get output status: output connection
+SECTION_INPUT = "input"  # get input status: input signal
+
+# Per-section polling intervals (seconds), configurable in the options flow.
+# Routing/power changes most often; signal detection and EDID less so.
+CONF_SCAN_INTERVAL_VIDEO = "scan_interval_video"
+CONF_SCAN_INTERVAL_OUTPUT = "scan_interval_output"
+CONF_SCAN_INTERVAL_INPUT = "scan_interval_input"
+DEFAULT_SCAN_INTERVAL_VIDEO = 15
+DEFAULT_SCAN_INTERVAL_OUTPUT = 45
+DEFAULT_SCAN_INTERVAL_INPUT = 45
+MIN_SCAN_INTERVAL = 2
+MAX_SCAN_INTERVAL = 3600
+
+# Signal sensor debounce (seconds), configurable in the options flow. A
+# signal change is shown once it has lasted CONF_SIGNAL_DEBOUNCE; a loss must
+# last CONF_SIGNAL_LOSS_DELAY longer; due changes are written together at most
+# once per CONF_SIGNAL_WRITE_INTERVAL. 0 disables each.
+CONF_SIGNAL_DEBOUNCE = "signal_debounce"
+CONF_SIGNAL_LOSS_DELAY = "signal_loss_delay"
+CONF_SIGNAL_WRITE_INTERVAL = "signal_write_interval"
+MAX_SIGNAL_DELAY = 3600
+
+# Debug option: keep the raw JSON payloads of the last poll (for diagnostics)
+CONF_KEEP_RAW = "keep_raw_payloads"
+
+# After a command or a detected change, poll video status at FAST_SCAN_INTERVAL
+# for FAST_POLL_WINDOW seconds so routing stays fresh.
+FAST_SCAN_INTERVAL = 2
+FAST_POLL_WINDOW = 30
+
+# Upper bound on device requests in flight across all configured matrices
+FLEET_MAX_CONCURRENT_REQUESTS = 4
+
+# Confirmation polling after a routing command: poll video status with
+# exponential backoff (seconds) until the route shows up or the deadline passes.
+CONFIRM_INITIAL_DELAY = 0.1
+CONFIRM_MAX_DELAY = 1.0
+CONFIRM_TIMEOUT = 5.0
+
+# Power lifecycle. While the matrix is off only `get status` is polled, every
+# OFF_SCAN_INTERVAL seconds. Once switched on it is booting: `get status` is
+# polled every BOOT_SCAN_INTERVAL seconds until it reports power on (or
+# BOOT_TIMEOUT passes), then every section is polled again and routes
+# requested in the meantime are sent. The matrix may report power on as soon
+# as it is asked to switch on, long before it takes commands, so it is not
+# ready before BOOT_MIN_TIME has passed either.
+POWER_OFF = "off"
+POWER_BOOTING = "booting"
+POWER_ON = "on"
+OFF_SCAN_INTERVAL = 60
+BOOT_SCAN_INTERVAL = 2
+BOOT_TIMEOUT = 90
+BOOT_MIN_TIME = 10
+
+# Matrix size used until the device reports its own (allinputname/allsource)
+DEFAULT_NUM_INPUTS = 4
+DEFAULT_NUM_OUTPUTS = 4
+
+# Last-known state saved across restarts (one store per config entry); writes
+# are coalesced over STORAGE_SAVE_DELAY seconds
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+# Network discovery in the config flow: at most DISCOVERY_MAX_HOSTS addresses
+# per sweep, DISCOVERY_MAX_CONCURRENT probes in flight, each given up after
+# DISCOVERY_TIMEOUT seconds (a /24 then takes a few seconds at worst)
+CONF_SUBNET = "subnet"
+CONF_HOSTS = "hosts"
+DISCOVERY_MAX_HOSTS = 1024
+DISCOVERY_MAX_CONCURRENT = 64
+DISCOVERY_TIMEOUT = 1.5
+
+# Dispatcher signal sent when a config entry unloads; format with the entry ID
+SIGNAL_ENTRY_UNLOADED = f"{DOMAIN}_entry_unloaded_{{}}"
+
+# Services
+SERVICE_APPLY_ROUTING = "apply_routing"
+SERVICE_RECALL_PRESET = "recall_preset"
+SERVICE_SAVE_PRESET = "save_preset"
+ATTR_ROUTING = "routing"
+ATTR_PRESET = "preset"
+
+# Events fired on the bus for each change the device reports. Route events
+# carry output, old_input and new_input; signal events carry signal ("input",
+# "output" or "power"), port (None for power), old and new. Both carry
+# entry_id, host and source: SOURCE_COMMAND if Home Assistant asked for the
+# change, SOURCE_EXTERNAL otherwise (front panel, IR remote, another
+# controller, or a signal the device detected).
+EVENT_ROUTE_CHANGED = f"{DOMAIN}_route_changed"
+EVENT_SIGNAL_CHANGED = f"{DOMAIN}_signal_changed"
+SOURCE_COMMAND = "command"
+SOURCE_EXTERNAL = "external"
 
 # Platforms
-PLATFORMS = ["switch", "select", "binary_sensor"]
+PLATFORMS = ["switch", "select", "binary_sensor", "button", "sensor"]
@@ -1,87 +1,996 @@
 """DataUpdateCoordinator for the OREI Matrix integration."""
 
+import asyncio
+import contextlib
 import logging
+import time
+from collections.abc import Callable
+from dataclasses import asdict, replace
 from datetime import timedelta
+from itertools import zip_longest
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .client import OreiMatrixClient
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .client import MatrixOfflineError, OreiMatrixClient
+from .const import (
+    BOOT_MIN_TIME,
+    BOOT_SCAN_INTERVAL,
+    BOOT_TIMEOUT,
+    CONFIRM_INITIAL_DELAY,
+    CONFIRM_MAX_DELAY,
+    CONFIRM_TIMEOUT,
+    DEFAULT_NUM_INPUTS,
+    DEFAULT_NUM_OUTPUTS,
+    DEFAULT_SCAN_INTERVAL_INPUT,
+    DEFAULT_SCAN_INTERVAL_OUTPUT,
+    DEFAULT_SCAN_INTERVAL_VIDEO,
+    DOMAIN,
+    EVENT_ROUTE_CHANGED,
+    EVENT_SIGNAL_CHANGED,
+    FAST_POLL_WINDOW,
+    FAST_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    OFF_SCAN_INTERVAL,
+    POWER_BOOTING,
+    POWER_OFF,
+    POWER_ON,
+    SECTION_INPUT,
+    SECTION_OUTPUT,
+    SECTION_VIDEO,
+    SOURCE_COMMAND,
+    SOURCE_EXTERNAL,
+    STORAGE_SAVE_DELAY,
+)
+from .models import MatrixState
+from .signals import SignalFilter
+from .stats import percentile
+from .transport import FEEDBACK_POWER, FEEDBACK_ROUTE, UNCHANGED
 
 _LOGGER = logging.getLogger(__name__)
 
+# Sections due within this many seconds are fetched on the current tick
+SCHEDULE_SLACK = 0.5
 
-class OreiMatrixCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Coordinator that polls the OREI matrix for current state."""
+# Listener slice notified after every update, for request statistics
+DIAGNOSTICS_SLICE = ("diagnostics",)
 
-    def __init__(self, hass: HomeAssistant, client: OreiMatrixClient) -> None:
+# Per-port fields reported in EVENT_SIGNAL_CHANGED, by event "signal" value
+_SIGNAL_EVENT_FIELDS = {"input_active": "input", "output_connected": "output"}
+
+# Request types sent by regular polls, as recorded in the client statistics
+POLL_COMHEADS = ("get video status", "get output status", "get input status")
+
+
+def _parse_video(video: dict[str, Any]) -> dict[str, Any]:
+    """Parse a ``get video status`` response into power, routing and names."""
+    # Routing: "allsource" = [1, 2, 2, 1, 0] — input per output, trailing 0.
+    # Its length gives the number of logical outputs (4 on a 4x4 unit, where
+    # HDMI + HDBaseT mirror the same routing; 8 or 16 on larger frames). An
+    # unrouted output also reads 0, so only the trailing sentinel is dropped:
+    # the output names give the size, else the last entry is the sentinel.
+    allsource = list(video.get("allsource", ()))
+    output_names = video.get("alloutputname", ())
+    if output_names:
+        routing = tuple(allsource[: len(output_names)])
+    else:
+        routing = tuple(allsource[:-1] if allsource[-1:] == [0] else allsource)
+
+    return {
+        # Power state (present in all responses)
+        "power": bool(video.get("power", 0)),
+        "routing": routing,
+        # Input names: "allinputname" = ["input1", "input2", "input3", "input4"]
+        "input_names": tuple(video.get("allinputname", ())),
+        # Output names: use HDMI names as the canonical output names
+        "output_names": tuple(output_names),
+        # Preset names: "allname" = ["preset1", ..., "preset8"], one per slot
+        "preset_names": tuple(video.get("allname", ())),
+    }
+
+
+def _parse_output(output: dict[str, Any]) -> dict[str, Any]:
+    """Parse a ``get output status`` response into per-output state."""
+    # Output connection: combine HDMI and HDBaseT — connected if either has signal
+    hdmi_conn = output.get("allconnect", ())
+    hdbt_conn = output.get("allhdbtconnect", ())
+    return {
+        "output_connected": tuple(
+            bool(hdmi or hdbt)
+            for hdmi, hdbt in zip_longest(hdmi_conn, hdbt_conn, fillvalue=0)
+        ),
+        # Stream enable: "allout" = [1, 1, 0, 1]; 0 = output switched off
+        "output_stream": tuple(bool(val) for val in output.get("allout", ())),
+        # Scaler and HDCP modes: device codes, one per output
+        "output_scaler": tuple(output.get("allscaler", ())),
+        "output_hdcp": tuple(output.get("allhdcp", ())),
+    }
+
+
+def _parse_input(input_st: dict[str, Any]) -> dict[str, Any]:
+    """Parse a ``get input status`` response into input signal state."""
+    # Input signal detection: "inactive" = [1, 0, 0, 0]
+    # Per-index: 1 = no signal (inactive), 0 = has signal (active)
+    return {
+        "input_active": tuple(val == 0 for val in input_st.get("inactive", ())),
+    }
+
+
+_PARSERS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    SECTION_VIDEO: _parse_video,
+    SECTION_OUTPUT: _parse_output,
+    SECTION_INPUT: _parse_input,
+}
+
+# Section whose parser fills each MatrixState field
+_FIELD_SECTIONS: dict[str, str] = {
+    **dict.fromkeys(
+        ("power", "routing", "input_names", "output_names", "preset_names"),
+        SECTION_VIDEO,
+    ),
+    **dict.fromkeys(
+        ("output_connected", "output_stream", "output_scaler", "output_hdcp"),
+        SECTION_OUTPUT,
+    ),
+    "input_active": SECTION_INPUT,
+}
+
+
+class OreiMatrixCoordinator(DataUpdateCoordinator[MatrixState]):
+    """Coordinator that polls the OREI matrix for current state.
+
+    Each status section has its own polling interval. The coordinator's
+    ``update_interval`` is re-armed after every refresh to wake up when the
+    next section is due, and only due sections are fetched (concurrently);
+    a timer that fires early fetches only the section due next.
+    Sections that no listener renders are not fetched at all (see
+    :meth:`_polled_sections`).
+    After a command or a detected change, video status is polled at
+    ``FAST_SCAN_INTERVAL`` for ``FAST_POLL_WINDOW`` seconds.
+
+    If only some endpoints fail, the last good data for those sections is
+    kept and the section is marked stale so dependent entities can flag it;
+    the refresh only fails when every fetched endpoint fails. When the
+    client's circuit breaker reports the device offline, the coordinator
+    fails at once (entities go unavailable) and runs a full refresh as soon
+    as the device is reachable again.
+
+    With a pushing transport, route and power changes reported by the device
+    are applied as they arrive, and routing commands are confirmed from them
+    without polling.
+
+    ``data`` is the state reported by the device with pending routing
+    commands (see :meth:`async_route`) overlaid, so every listener sees a
+    route as soon as it is requested. A pending route is dropped once the
+    device reports it, or reverted if its command fails or is not confirmed
+    within ``CONFIRM_TIMEOUT``.
+
+    Given a ``store``, the reported state is saved (debounced) as it changes.
+    :meth:`async_restore` loads it at startup with every section marked
+    stale, so entities can be created before the device has answered.
+
+    Listeners subscribe with a context of data slices (see
+    ``OreiMatrixEntity``). After each update the new state is diffed against
+    what listeners last saw and only those whose slices changed are called;
+    an unchanged poll notifies only ``DIAGNOSTICS_SLICE`` listeners.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: OreiMatrixClient,
+        scan_intervals: dict[str, float] | None = None,
+        keep_raw: bool = False,
+        store: Store[dict[str, Any]] | None = None,
+        signal_filter: SignalFilter | None = None,
+    ) -> None:
+        self._scan_intervals = {
+            SECTION_VIDEO: DEFAULT_SCAN_INTERVAL_VIDEO,
+            SECTION_OUTPUT: DEFAULT_SCAN_INTERVAL_OUTPUT,
+            SECTION_INPUT: DEFAULT_SCAN_INTERVAL_INPUT,
+            **(scan_intervals or {}),
+        }
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=timedelta(seconds=min(self._scan_intervals.values())),
         )
         self.client = client
+        # Raw endpoint payloads by section, kept only for debugging
+        self._keep_raw = keep_raw
+        self.raw_payloads: dict[str, dict[str, Any]] = {}
+        # Monotonic time each section is next due; 0 means due now
+        self._next_due: dict[str, float] = dict.fromkeys(self._scan_intervals, 0.0)
+        self._fast_until = 0.0
+        # Set by async_refresh (and so by refresh requests), unlike the
+        # coordinator's own timer, which may fire before anything is due
+        self._refresh_requested = False
+        # Fleet grid (see OreiMatrixFleetScheduler): origin and phase in [0, 1)
+        self._epoch = 0.0
+        self._phase: float | None = None
+        # Sections whose last fetch failed; their data is last-known
+        self._stale: set[str] = set()
+        # Seconds from the last routing command to its confirmation
+        self.last_command_latency: float | None = None
+        # Seconds the last scheduled poll took, from first request to last reply
+        self.last_poll_duration: float | None = None
+        # State as of the last listener fan-out, for change detection
+        self._notified_data: MatrixState | None = None
+        self._notified_stale: frozenset[str] = frozenset()
+        self._notified_success = True
+        client.add_connection_listener(self._async_connection_changed)
+        # Last state reported by the device, without pending commands
+        self._reported: MatrixState | None = None
+        # Routes requested but not yet reported by the device: output -> input
+        self._pending_routes: dict[int, int] = {}
+        # Routes pushed by the device: output -> (input, monotonic time)
+        self._pushed_routes: dict[int, tuple[int, float]] = {}
+        self._pushed = asyncio.Event()
+        client.add_feedback_listener(self._async_feedback)
+        # Last-known state across restarts: the store, the state last handed
+        # to it, and whether data is still the unconfirmed restored snapshot
+        self._store = store
+        self._saved: MatrixState | None = None
+        self._restored = False
+        # Sections fetched by the last scheduled poll
+        self.polled_sections: frozenset[str] = frozenset(self._scan_intervals)
+        # Debounce of the signal fields listeners see, and the timer that
+        # releases held-back changes
+        if signal_filter is not None and not signal_filter.active:
+            signal_filter = None
+        self._signal_filter = signal_filter
+        self._unsub_signal_check: CALLBACK_TYPE | None = None
+        # State change events were last computed from (reported, signals as
+        # shown), and the commands whose effects count as SOURCE_COMMAND
+        self._evented: MatrixState | None = None
+        self._commanded_power: bool | None = None
+        self._power_command_until = 0.0
+        self._preset_recalls = 0
+        # Power lifecycle (POWER_*), when the matrix may be ready at the
+        # earliest, when waiting for the boot gives up, and routes requested
+        # while booting, sent once the matrix is ready
+        self.power_state = POWER_ON
+        self._boot_ready_at = 0.0
+        self._boot_until = 0.0
+        self._queued_routes: dict[int, int] = {}
+        self._notified_power_state = POWER_ON
+
+    @property
+    def num_inputs(self) -> int:
+        """Return the number of matrix inputs, as reported by the device."""
+        if self.data is not None and self.data.num_inputs:
+            return self.data.num_inputs
+        return DEFAULT_NUM_INPUTS
+
+    @property
+    def num_outputs(self) -> int:
+        """Return the number of matrix outputs, as reported by the device."""
+        if self.data is not None and self.data.num_outputs:
+            return self.data.num_outputs
+        return DEFAULT_NUM_OUTPUTS
+
+    def _fetchers(self) -> dict[str, Callable[[], Any]]:
+        """Return the client call for each status section."""
+        return {
+            SECTION_VIDEO: self.client.get_video_status,
+            SECTION_OUTPUT: self.client.get_output_status,
+            SECTION_INPUT: self.client.get_input_status,
+        }
+
+    def _interval(self, section: str, now: float) -> float:
+        """Return the current polling interval for a section."""
+        interval = self._scan_intervals[section]
+        if section == SECTION_VIDEO and now < self._fast_until:
+            return min(interval, FAST_SCAN_INTERVAL)
+        return interval
+
+    @callback
+    def async_set_phase(self, epoch: float, phase: float) -> None:
+        """Align this matrix's polls to a slot on the fleet-wide grid.
+
+        Scheduled polls then fall at ``epoch + (phase + k) * interval``, so
+        matrices given different phases are polled at different times.
+        """
+        self._epoch = epoch
+        self._phase = phase
+        for section, due in self._next_due.items():
+            if due:
+                self._next_due[section] = self._align(
+                    due, self._scan_intervals[section]
+                )
+
+    def _align(self, due: float, interval: float) -> float:
+        """Snap a due time to this matrix's nearest slot on the fleet grid."""
+        if self._phase is None:
+            return due
+        offset = self._epoch + self._phase * interval
+        return offset + round((due - offset) / interval) * interval
+
+    async def async_restore(self) -> bool:
+        """Load the saved state, marking every section stale until polled.
+
+        Returns True if a state was restored.
+        """
+        if self._store is None or (saved := await self._store.async_load()) is None:
+            return False
+        try:
+            state = MatrixState.from_dict(saved)
+        except (TypeError, ValueError) as err:
+            _LOGGER.debug(
+                "OREI matrix %s: ignoring saved state: %s", self.client.host, err
+            )
+            return False
+        if not state.num_outputs:
+            return False
+        self._reported = self._saved = self.data = state
+        self._stale.update(self._next_due)
+        self._restored = True
+        return True
+
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the state to save."""
+        return asdict(self._saved)
+
+    @callback
+    def _async_connection_changed(self, online: bool) -> None:
+        """Fail fast while the device is offline; refresh fully on recovery."""
+        if not online:
+            # Mark entities unavailable now rather than at the next poll
+            self.async_set_update_error(
+                UpdateFailed(f"OREI matrix {self.client.host} is offline")
+            )
+            return
+        for section in self._next_due:
+            self._next_due[section] = 0.0
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_feedback(self, kind: str, value: Any) -> None:
+        """Apply a state change pushed by the device."""
+        if self._reported is None:
+            return
+        if kind == FEEDBACK_ROUTE:
+            output_num, input_num = value
+            if output_num > self.num_outputs:
+                return
+            self._pushed_routes[output_num] = (input_num, time.monotonic())
+            state = self._reported.with_route(output_num, input_num)
+        elif kind == FEEDBACK_POWER:
+            state = replace(self._reported, power=value)
+            if value and self.power_state == POWER_OFF:
+                # Switched on elsewhere: watch the boot now, not at the next
+                # slow poll
+                self.hass.async_create_task(self.async_refresh())
+        else:
+            return
+        self._pushed.set()
+        if state != self._reported:
+            # The next video status differs from this state even if its
+            # body matches the last one, so it must be parsed again
+            self.client.forget_response("get video status")
+            self.async_set_updated_data(self._set_reported(state))
+
+    def _set_reported(self, state: MatrixState) -> MatrixState:
+        """Store a device-reported state; return it as listeners should see it.
+
+        Pending routes are overlaid; those the device now reports are
+        confirmed and dropped. Signal changes still held back by the signal
+        filter are left out, and re-applied when they are due.
+        """
+        self._reported = state
+        self._track_power(state.power)
+        if self._store is not None and state != self._saved:
+            self._saved = state
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        if self._signal_filter is not None:
+            state, due = self._signal_filter.apply(state, time.monotonic())
+            self._schedule_signal_check(due)
+        commanded = set()
+        for output_num, input_num in list(self._pending_routes.items()):
+            if state.route(output_num) == input_num:
+                del self._pending_routes[output_num]
+                commanded.add(output_num)
+        self._fire_change_events(state, commanded)
+        for output_num, input_num in self._pending_routes.items():
+            state = state.with_route(output_num, input_num)
+        return state
+
+    def _track_power(self, power: bool) -> None:
+        """Follow the power lifecycle as the device reports power.
+
+        A matrix reporting power off is off, unless it is booting: it may
+        still say so until it is ready. One reporting power on while off has
+        been switched on elsewhere and is booting. Right after a power
+        command, reports of the old power state are ignored.
+        """
+        if (
+            self._commanded_power is not None
+            and power != self._commanded_power
+            and time.monotonic() < self._power_command_until
+        ):
+            return
+        if not power and self.power_state == POWER_ON:
+            self._set_power_state(POWER_OFF)
+        elif power and self.power_state == POWER_OFF:
+            self._set_power_state(POWER_BOOTING)
+
+    def _set_power_state(self, power_state: str) -> None:
+        """Enter a power lifecycle state."""
+        if power_state == self.power_state:
+            return
+        _LOGGER.debug(
+            "OREI matrix %s: power %s -> %s",
+            self.client.host, self.power_state, power_state,
+        )
+        self.power_state = power_state
+        if power_state == POWER_BOOTING:
+            now = time.monotonic()
+            self._boot_ready_at = now + BOOT_MIN_TIME
+            self._boot_until = now + BOOT_TIMEOUT
+            self.update_interval = timedelta(seconds=BOOT_SCAN_INTERVAL)
+        elif power_state == POWER_ON:
+            # Everything may have changed while the matrix was off
+            self._next_due = dict.fromkeys(self._next_due, 0.0)
+            if self._queued_routes:
+                routes, self._queued_routes = self._queued_routes, {}
+                _LOGGER.debug(
+                    "OREI matrix %s: sending routes queued during boot %s",
+                    self.client.host, routes,
+                )
+                self.hass.async_create_task(self.async_route(routes))
+        elif self._queued_routes:
+            # Switched off before it was ready
+            routes, self._queued_routes = self._queued_routes, {}
+            self._async_drop_pending(routes)
+
+    def _fire_change_events(self, state: MatrixState, commanded: set[int]) -> None:
+        """Fire one event per route, power or signal change since last time.
+
+        ``commanded`` holds the outputs whose new route Home Assistant asked
+        for. Nothing is fired for the first state after setup, nor for a field
+        whose port count changed.
+        """
+        previous, self._evented = self._evented, state
+        if previous is None:
+            return
+        base = {
+            "entry_id": self.config_entry.entry_id if self.config_entry else None,
+            "host": self.client.host,
+        }
+        for field, *port in sorted(state.changed_slices(previous)):
+            if port and len(getattr(state, field)) != len(getattr(previous, field)):
+                continue
+            if field == "routing":
+                output_num = port[0]
+                source = (
+                    SOURCE_COMMAND
+                    if output_num in commanded or self._preset_recalls
+                    else SOURCE_EXTERNAL
+                )
+                self.hass.bus.async_fire(
+                    EVENT_ROUTE_CHANGED,
+                    {
+                        **base,
+                        "output": output_num,
+                        "old_input": previous.route(output_num),
+                        "new_input": state.route(output_num),
+                        "source": source,
+                    },
+                )
+            elif field == "power":
+                source = (
+                    SOURCE_COMMAND
+                    if self._commanded_power == state.power
+                    else SOURCE_EXTERNAL
+                )
+                self.hass.bus.async_fire(
+                    EVENT_SIGNAL_CHANGED,
+                    {
+                        **base,
+                        "signal": "power",
+                        "port": None,
+                        "old": previous.power,
+                        "new": state.power,
+                        "source": source,
+                    },
+                )
+            elif field in _SIGNAL_EVENT_FIELDS:
+                self.hass.bus.async_fire(
+                    EVENT_SIGNAL_CHANGED,
+                    {
+                        **base,
+                        "signal": _SIGNAL_EVENT_FIELDS[field],
+                        "port": port[0],
+                        "old": previous.port_value(field, port[0]),
+                        "new": state.port_value(field, port[0]),
+                        "source": SOURCE_EXTERNAL,
+                    },
+                )
+        if self._commanded_power == state.power:
+            self._commanded_power = None
+
+    def _schedule_signal_check(self, due: float | None) -> None:
+        """Re-publish the reported state when a held-back signal is due."""
+        if self._unsub_signal_check is not None:
+            self._unsub_signal_check()
+            self._unsub_signal_check = None
+        if due is not None:
+            self._unsub_signal_check = async_call_later(
+                self.hass, max(due - time.monotonic(), 0), self._async_signal_check
+            )
+
+    @callback
+    def _async_signal_check(self, _now: Any) -> None:
+        """Release signal changes that are now due."""
+        self._unsub_signal_check = None
+        self._async_publish_pending()
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from the matrix device."""
+    @callback
+    def _async_publish_pending(self) -> None:
+        """Notify listeners after pending routes or held-back signals changed."""
+        if self._reported is not None:
+            self.data = self._set_reported(self._reported)
+            self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the signal timer and stop polling."""
+        self._schedule_signal_check(None)
+        await super().async_shutdown()
+
+    @callback
+    def _async_drop_pending(self, routes: dict[int, int]) -> None:
+        """Revert routes that are still pending."""
+        dropped = False
+        for output_num, input_num in routes.items():
+            if self._pending_routes.get(output_num) == input_num:
+                del self._pending_routes[output_num]
+                dropped = True
+        if dropped:
+            _LOGGER.debug("OREI matrix %s: reverted %s", self.client.host, routes)
+            self._async_publish_pending()
+
+    async def async_route(self, routes: dict[int, int]) -> list[Exception]:
+        """Switch outputs to inputs (``{output: input}``), shown at once.
+
+        Listeners see the new routes before any command is sent. Commands
+        that fail are reverted straight away; the rest are confirmed with
+        :meth:`async_confirm_routing` and reverted if that times out. While
+        the matrix is booting the routes are queued and sent once it is
+        ready. Returns the errors of the commands that failed.
+        """
+        started = time.monotonic()
+        self._pending_routes.update(routes)
+        self._async_publish_pending()
+        if self.power_state == POWER_BOOTING:
+            # Shown now, sent once the matrix is ready
+            self._queued_routes.update(routes)
+            return []
+
+        results = await asyncio.gather(
+            *(
+                self.client.video_switch(input_num, output_num)
+                for output_num, input_num in routes.items()
+            ),
+            return_exceptions=True,
+        )
+        sent: dict[int, int] = {}
+        failed: dict[int, int] = {}
+        for (output_num, input_num), result in zip(routes.items(), results):
+            if isinstance(result, Exception):
+                failed[output_num] = input_num
+            else:
+                sent[output_num] = input_num
+        self._async_drop_pending(failed)
+        if sent:
+            await self.async_confirm_routing(sent, started)
+        return [result for result in results if isinstance(result, Exception)]
+
+    async def async_set_power(self, on: bool) -> None:
+        """Switch the matrix on or off, then poll until it reports the change.
+
+        Switching on from off starts the boot (see ``BOOT_SCAN_INTERVAL``)
+        before the command is sent, so routes requested meanwhile, e.g. by
+        the same scene, are queued until the matrix is ready.
+        """
+        self._commanded_power = on
+        self._power_command_until = time.monotonic() + CONFIRM_TIMEOUT
+        booting = on and self.power_state == POWER_OFF
+        if booting:
+            self._set_power_state(POWER_BOOTING)
+            self.async_update_listeners()
+        try:
+            await self.client.set_power(on)
+        except Exception:
+            self._commanded_power = None
+            if booting and self.power_state == POWER_BOOTING:
+                # Still off: drops the routes queued in the meantime
+                self._set_power_state(POWER_OFF)
+                self.async_update_listeners()
+            raise
+        if not on:
+            self._set_power_state(POWER_OFF)
+        self.async_update_listeners()
+        self.async_fast_poll()
+        if booting:
+            # Start the boot polls now; a debounced request could wait
+            # longer than the boot poll interval
+            await self.async_refresh()
+        else:
+            await self.async_request_refresh()
+
+    async def async_recall_preset(self, preset: int) -> None:
+        """Recall a device preset and poll once for the routes it sets.
+
+        Route changes reported until that poll returns count as commanded.
+        """
+        self._preset_recalls += 1
+        try:
+            await self.client.preset_recall(preset)
+            await self.async_confirm_routing({})
+        finally:
+            self._preset_recalls -= 1
+
+    @callback
+    def async_fast_poll(self) -> None:
+        """Poll routing now and at the fast rate for a short window.
+
+        Call after sending a command; follow up with a refresh request.
+        """
+        now = time.monotonic()
+        self._fast_until = now + FAST_POLL_WINDOW
+        self._next_due[SECTION_VIDEO] = now
+
+    def _polled_sections(self) -> frozenset[str]:
+        """Return the sections the current listeners render.
+
+        Listeners' contexts name the state fields they use, so e.g. with every
+        binary sensor disabled neither signal endpoint is fetched. Video
+        status is always fetched: it carries power, the matrix size and the
+        names everything else is labelled with. Before any listener subscribes
+        (during setup), or while one subscribes without a context (the card's
+        websocket feed), every section is fetched.
+        """
+        if not self._listeners:
+            return frozenset(self._scan_intervals)
+        sections = {SECTION_VIDEO}
+        for _, context in self._listeners.values():
+            if context is None:
+                return frozenset(self._scan_intervals)
+            sections.update(
+                _FIELD_SECTIONS[slice_[0]]
+                for slice_ in context
+                if slice_[0] in _FIELD_SECTIONS
+            )
+        return frozenset(sections)
+
+    def _schedule_next(self, now: float, sections: frozenset[str]) -> None:
+        """Re-arm the coordinator timer for the next due section."""
+        for section in sections:
+            # Pull a section forward if the fast window shortened its interval
+            interval = self._interval(section, now)
+            if interval < self._scan_intervals[section]:
+                self._next_due[section] = min(self._next_due[section], now + interval)
+        next_due = min(self._next_due[section] for section in sections)
+        delay = max(next_due - now, MIN_SCAN_INTERVAL)
+        self.update_interval = timedelta(seconds=delay)
+
+    async def async_refresh(self) -> None:
+        """Refresh now; with nothing due, every polled section is fetched."""
+        self._refresh_requested = True
+        await super().async_refresh()
+
+    async def _async_update_data(self) -> MatrixState:
+        """Fetch the due status sections from the matrix device."""
+        now = time.monotonic()
+        requested, self._refresh_requested = self._refresh_requested, False
+        if (
+            self.power_state != POWER_ON
+            and self.data is not None
+            and (state := await self._async_poll_power(now)) is not None
+        ):
+            return state
+        polled = self._polled_sections()
+        if polled != self.polled_sections:
+            _LOGGER.debug(
+                "OREI matrix %s: polling %s", self.client.host, sorted(polled)
+            )
+            self.polled_sections = polled
+        fetchers = {
+            section: fetch
+            for section, fetch in self._fetchers().items()
+            if section in polled
+        }
+        due = [
+            section
+            for section in fetchers
+            if self._next_due[section] <= now + SCHEDULE_SLACK
+        ]
+        if self.data is None or (not due and requested):
+            # Explicit refresh requests outside the schedule fetch everything
+            due = list(fetchers)
+        elif not due and fetchers:
+            # The timer fired early: fetch what is due next, nothing else
+            first = min(self._next_due[section] for section in fetchers)
+            due = [
+                section
+                for section in fetchers
+                if self._next_due[section] <= first + SCHEDULE_SLACK
+            ]
+        for section in due:
+            interval = self._interval(section, now)
+            if interval == self._scan_intervals[section]:
+                self._next_due[section] = self._align(now + interval, interval)
+            else:
+                self._next_due[section] = now + interval
+
+        results = await asyncio.gather(
+            *(fetchers[section](if_changed=True) for section in due),
+            return_exceptions=True,
+        )
+        self.last_poll_duration = time.monotonic() - now
+
+        state = self._reported or MatrixState()
+        previous_stale = frozenset(self._stale)
+        errors: list[BaseException] = []
+
+        for section, result in zip(due, results):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                self._stale.add(section)
+                errors.append(result)
+                # If the device went offline the client has already said so
+                if section not in previous_stale and not self.client.offline:
+                    _LOGGER.warning(
+                        "OREI matrix %s: %s status unavailable, keeping last data: %s",
+                        self.client.host, section, result,
+                    )
+                continue
+            state = self._merge_section(state, section, result)
+
+        if (
+            self._reported is not None
+            and state != self._reported
+            and not self._restored
+        ):
+            # Something changed outside our control; keep routing fresh
+            self._fast_until = now + FAST_POLL_WINDOW
+        self._schedule_next(now, polled)
+
+        if len(errors) == len(due):
+            err = errors[0]
+            if isinstance(err, ConnectionError):
+                raise UpdateFailed(
+                    f"Error communicating with OREI matrix: {err}"
+                ) from err
+            raise UpdateFailed(f"Unexpected error: {err}") from err
+
+        self._restored = False
+        if state is self._reported and self.data is not None:
+            # Every section was byte-identical: nothing was parsed, and the
+            # listener diff sees the same object and notifies no one
+            return self.data
+        return self._set_reported(state)
+
+    async def _async_poll_power(self, now: float) -> MatrixState | None:
+        """Poll only ``get status`` while the matrix is off or booting.
+
+        Returns the state to publish, or None once the matrix is ready and
+        every section is to be polled again.
+        """
+        booting = self.power_state == POWER_BOOTING
+        self.update_interval = timedelta(
+            seconds=BOOT_SCAN_INTERVAL if booting else OFF_SCAN_INTERVAL
+        )
+        # A matrix that is still booting may not answer; that is not the
+        # device going offline
+        expected = booting and now < self._boot_until
         try:
-            video = await self.client.get_video_status()
-            output = await self.client.get_output_status()
-            input_st = await self.client.get_input_status()
+            status = await self.client.get_status(counted=not expected)
         except ConnectionError as err:
+            if expected:
+                # Not answering is part of booting
+                _LOGGER.debug("OREI matrix %s booting: %s", self.client.host, err)
+                return self.data
             raise UpdateFailed(f"Error communicating with OREI matrix: {err}") from err
-        except Exception as err:
-            raise UpdateFailed(f"Unexpected error: {err}") from err
 
-        # Power state (present in all responses)
-        power = video.get("power", 0)
+        power = bool(status.get("power", 0))
+        reported = self._reported or MatrixState()
+        state = self.data
+        if power != reported.power:
+            self.client.forget_response("get video status")
+            state = self._set_reported(replace(reported, power=power))
+        if self.power_state == POWER_BOOTING and (
+            (power and now >= self._boot_ready_at) or now >= self._boot_until
+        ):
+            if not power:
+                _LOGGER.warning(
+                    "OREI matrix %s did not report power on within %s s",
+                    self.client.host, BOOT_TIMEOUT,
+                )
+            self._set_power_state(POWER_ON)
+            return None
+        if self.power_state == POWER_BOOTING:
+            self.update_interval = timedelta(seconds=BOOT_SCAN_INTERVAL)
+        return state
 
-        # Routing: "allsource" = [1, 2, 2, 1, 0] — input per output, trailing 0
-        # 4 logical outputs (HDMI + HDBaseT mirror the same routing)
-        routing = {}
-        allsource = video.get("allsource", [])
-        for idx, src in enumerate(allsource):
-            if src == 0:  # trailing sentinel
-                break
-            routing[idx + 1] = src
+    def _merge_section(
+        self, state: MatrixState, section: str, result: dict[str, Any]
+    ) -> MatrixState:
+        """Return ``state`` updated with a parsed section response."""
+        if section in self._stale:
+            self._stale.discard(section)
+            if not self._restored:
+                _LOGGER.info(
+                    "OREI matrix %s: %s status recovered", self.client.host, section
+                )
+        if result is UNCHANGED:
+            return state
+        if self._keep_raw:
+            self.raw_payloads[section] = result
+        return replace(state, **_PARSERS[section](result))
 
-        # Input names: "allinputname" = ["input1", "input2", "input3", "input4"]
-        input_names = {}
-        for idx, name in enumerate(video.get("allinputname", [])):
-            input_names[idx + 1] = name
+    async def async_confirm_routing(
+        self, expected: dict[int, int], started: float | None = None
+    ) -> float | None:
+        """Poll only video status until the expected routes are reported.
 
-        # Output names: use HDMI names as the canonical output names
-        output_names = {}
-        for idx, name in enumerate(video.get("alloutputname", [])):
-            output_names[idx + 1] = name
-
-        # Input signal detection: "inactive" = [1, 0, 0, 0]
-        # Per-index: 1 = no signal (inactive), 0 = has signal (active)
-        input_active = {}
-        inactive_arr = input_st.get("inactive", [])
-        for idx, val in enumerate(inactive_arr):
-            input_active[idx + 1] = val == 0
-
-        # Output connection: combine HDMI and HDBaseT — connected if either has signal
-        output_connected = {}
-        hdmi_conn = output.get("allconnect", [])
-        hdbt_conn = output.get("allhdbtconnect", [])
-        for idx in range(max(len(hdmi_conn), len(hdbt_conn))):
-            hdmi_val = hdmi_conn[idx] if idx < len(hdmi_conn) else 0
-            hdbt_val = hdbt_conn[idx] if idx < len(hdbt_conn) else 0
-            output_connected[idx + 1] = bool(hdmi_val or hdbt_val)
+        Polls with a short exponential backoff until every output in
+        ``expected`` reports its input, or ``CONFIRM_TIMEOUT`` passes. An
+        empty ``expected`` returns after the first successful poll. Input and
+        output status are not touched. Routes pushed by the device since
+        ``started`` count as confirmation, without a poll. Routes replaced by
+        a later route for the same output are no longer waited for. Returns
+        the confirmed latency in seconds, measured from ``started`` (e.g.
+        just before the command was sent), or None if not confirmed in time
+        or superseded; any of ``expected`` still pending is then reverted.
+        """
+        start = time.monotonic() if started is None else started
+        self._fast_until = time.monotonic() + FAST_POLL_WINDOW
+        try:
+            return await self._async_poll_until_confirmed(expected, start)
+        finally:
+            self._async_drop_pending(expected)
 
-        return {
-            "power": bool(power),
-            "routing": routing,
-            "input_names": input_names,
-            "output_names": output_names,
-            "input_active": input_active,
-            "output_connected": output_connected,
-            "video_raw": video,
-            "output_raw": output,
-            "input_raw": input_st,
-        }
+    async def _async_poll_until_confirmed(
+        self, expected: dict[int, int], start: float
+    ) -> float | None:
+        """Poll video status with backoff; see :meth:`async_confirm_routing`."""
+        deadline = start + CONFIRM_TIMEOUT
+        delay = CONFIRM_INITIAL_DELAY
+        while True:
+            # A later route for the same output replaces this one (the client
+            # may not even send it), so there is nothing left to confirm
+            superseded = {
+                out: inp
+                for out, inp in expected.items()
+                if self._pending_routes.get(out, inp) != inp
+            }
+            if superseded:
+                _LOGGER.debug(
+                    "OREI matrix %s: %s superseded before confirmation",
+                    self.client.host, superseded,
+                )
+                expected = {
+                    out: inp for out, inp in expected.items() if out not in superseded
+                }
+                if not expected:
+                    return None
+            if (latency := self._pushed_latency(expected, start)) is not None:
+                return self._confirmed(expected, latency)
+            try:
+                video = await self.client.get_video_status(if_changed=True)
+            except MatrixOfflineError:
+                return None
+            except ConnectionError as err:
+                _LOGGER.debug("Confirmation poll failed: %s", err)
+            else:
+                now = time.monotonic()
+                state = self._merge_section(
+                    self._reported or MatrixState(), SECTION_VIDEO, video
+                )
+                self._next_due[SECTION_VIDEO] = now + self._interval(SECTION_VIDEO, now)
+                self.async_set_updated_data(self._set_reported(state))
+                if all(state.route(out) == inp for out, inp in expected.items()):
+                    return self._confirmed(expected, now - start)
+
+            if time.monotonic() + delay > deadline:
+                _LOGGER.warning(
+                    "OREI matrix %s did not confirm routing %s within %s s",
+                    self.client.host, expected, CONFIRM_TIMEOUT,
+                )
+                return None
+            # Wake early if the device pushes a change in the meantime
+            self._pushed.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._pushed.wait(), delay)
+            delay = min(delay * 2, CONFIRM_MAX_DELAY)
+
+    def _pushed_latency(self, expected: dict[int, int], start: float) -> float | None:
+        """Return when pushes confirmed every expected route, if they have."""
+        if not expected:
+            return None
+        latest = start
+        for output_num, input_num in expected.items():
+            pushed = self._pushed_routes.get(output_num)
+            if pushed is None or pushed[0] != input_num or pushed[1] < start:
+                return None
+            latest = max(latest, pushed[1])
+        return latest - start
+
+    def _confirmed(self, expected: dict[int, int], latency: float) -> float:
+        """Record and return the latency of a confirmed routing command."""
+        self.last_command_latency = latency
+        _LOGGER.debug(
+            "OREI matrix %s: confirmed %s in %.0f ms",
+            self.client.host, expected, latency * 1000,
+        )
+        return latency
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners whose data slices changed."""
+        previous = self._notified_data
+        previous_stale = self._notified_stale
+        previous_power_state = self._notified_power_state
+        self._notified_data = self.data
+        self._notified_stale = frozenset(self._stale)
+        self._notified_power_state = self.power_state
+
+        if (
+            previous is None
+            or self.data is None
+            or self.last_update_success != self._notified_success
+        ):
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        changed = self.data.changed_slices(previous)
+        changed.update(("stale", section) for section in previous_stale ^ self._stale)
+        if self.power_state != previous_power_state:
+            changed.add(("power_state",))
+        if changed:
+            _LOGGER.debug("OREI matrix %s: changed %s", self.client.host, changed)
+        changed.add(DIAGNOSTICS_SLICE)
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not changed.isdisjoint(context):
+                update_callback()
+
+    def is_stale(self, sections: tuple[str, ...]) -> bool:
+        """Return True if any of the given sections holds last-known data."""
+        return any(section in self._stale for section in sections)
+
+    @property
+    def stale_sections(self) -> frozenset[str]:
+        """Return the sections currently holding last-known data."""
+        return frozenset(self._stale)
+
+    def poll_latency(self, pct: float) -> float | None:
+        """Return a percentile of recent poll request latencies, in seconds."""
+        return percentile(
+            (
+                latency
+                for comhead in POLL_COMHEADS
+                if (stats := self.client.stats.get(comhead))
+                for latency in stats.latencies
+            ),
+            pct,
+        )
+
+    @property
+    def poll_failure_rate(self) -> float | None:
+        """Return the fraction of recent poll requests that failed."""
+        outcomes = [
+            ok
+            for comhead in POLL_COMHEADS
+            if (stats := self.client.stats.get(comhead))
+            for _, ok in stats.recent
+        ]
+        if not outcomes:
+            return None
+        return outcomes.count(False) / len(outcomes)
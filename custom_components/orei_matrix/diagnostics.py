@@ -0,0 +1,65 @@
+"""Diagnostics support for the OREI Matrix integration."""
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .client import OreiMatrixClient
+from .const import DOMAIN
+from .coordinator import OreiMatrixCoordinator
+from .scheduler import async_get_scheduler
+
+TO_REDACT = {CONF_HOST, "ip", "mac"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Per-request latency, queue wait and failure statistics show whether
+    slowness comes from the device and network (latency), from requests
+    queueing behind each other (queue wait) or from polling itself.
+    """
+    data = hass.data[DOMAIN][entry.entry_id]
+    client: OreiMatrixClient = data["client"]
+    coordinator: OreiMatrixCoordinator = data["coordinator"]
+    scheduler = async_get_scheduler(hass)
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "last_poll_duration": coordinator.last_poll_duration,
+            "last_command_latency": coordinator.last_command_latency,
+            "stale_sections": sorted(coordinator.stale_sections),
+            "polled_sections": sorted(coordinator.polled_sections),
+            "power_state": coordinator.power_state,
+            "state": asdict(coordinator.data) if coordinator.data else None,
+            "raw_payloads": async_redact_data(coordinator.raw_payloads, TO_REDACT),
+        },
+        "client": {
+            "offline": client.offline,
+            "queue_depth": client.queue_depth,
+            "requests": {
+                comhead: stats.as_dict() for comhead, stats in client.stats.items()
+            },
+        },
+        "fleet": {
+            "in_flight": scheduler.in_flight,
+            "waiting": scheduler.waiting,
+            "queue_depth": scheduler.queue_depth,
+        },
+    }
@@ -0,0 +1,117 @@
+"""Find OREI matrices on the local network.
+
+Every address in a subnet or range is sent the ``get status`` request used
+to validate a host, with a bounded number of probes in flight. Hosts that
+answer it as an OREI matrix are returned with their model, firmware and
+MAC address.
+"""
+
+import asyncio
+import ipaddress
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import aiohttp
+
+from .const import (
+    DEFAULT_PORT,
+    DISCOVERY_MAX_CONCURRENT,
+    DISCOVERY_MAX_HOSTS,
+    DISCOVERY_TIMEOUT,
+)
+from .transport import HttpTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DiscoveredMatrix:
+    """A matrix that answered a discovery probe."""
+
+    host: str
+    model: str
+    firmware: str | None = None
+    mac: str | None = None
+
+    @property
+    def label(self) -> str:
+        """Return a one-line description for the config flow."""
+        details = [self.host]
+        if self.firmware:
+            details.append(f"firmware {self.firmware}")
+        if self.mac:
+            details.append(f"MAC {self.mac}")
+        return f"{self.model} ({', '.join(details)})"
+
+
+def parse_hosts(value: str) -> list[str]:
+    """Return the addresses in a subnet, range or single address.
+
+    Accepts ``192.168.1.0/24``, ``192.168.1.10-192.168.1.40``,
+    ``192.168.1.10-40`` or ``192.168.1.10``. Raises ``ValueError`` if the
+    value is not understood or holds more than ``DISCOVERY_MAX_HOSTS``.
+    """
+    value = value.strip()
+    if "/" in value:
+        network = ipaddress.ip_network(value, strict=False)
+        if network.num_addresses > DISCOVERY_MAX_HOSTS + 2:
+            raise ValueError(f"{value} has more than {DISCOVERY_MAX_HOSTS} hosts")
+        return [str(address) for address in network.hosts()]
+
+    first, sep, last = value.partition("-")
+    start = ipaddress.ip_address(first.strip())
+    if not sep:
+        return [str(start)]
+    last = last.strip()
+    if "." not in last and ":" not in last:
+        # Short form: last octet only
+        last = f"{first.strip().rsplit('.', 1)[0]}.{last}"
+    end = ipaddress.ip_address(last)
+    if end.version != start.version or end < start:
+        raise ValueError(f"{value} is not an address range")
+    if int(end) - int(start) >= DISCOVERY_MAX_HOSTS:
+        raise ValueError(f"{value} has more than {DISCOVERY_MAX_HOSTS} hosts")
+    return [str(start + offset) for offset in range(int(end) - int(start) + 1)]
+
+
+async def async_discover(
+    session: aiohttp.ClientSession,
+    hosts: Iterable[str],
+    port: int = DEFAULT_PORT,
+    max_concurrent: int = DISCOVERY_MAX_CONCURRENT,
+) -> list[DiscoveredMatrix]:
+    """Probe ``hosts`` concurrently and return the matrices that answered."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def probe(host: str) -> DiscoveredMatrix | None:
+        async with semaphore:
+            return await _async_probe(session, host, port)
+
+    results = await asyncio.gather(*(probe(host) for host in hosts))
+    found = [matrix for matrix in results if matrix is not None]
+    _LOGGER.debug("Discovered %d OREI matrices: %s", len(found), found)
+    return found
+
+
+async def _async_probe(
+    session: aiohttp.ClientSession, host: str, port: int
+) -> DiscoveredMatrix | None:
+    """Send ``get status`` to one host; return it if it is a matrix."""
+    transport = HttpTransport(host, port, session)
+    try:
+        status = await asyncio.wait_for(
+            transport.request({"comhead": "get status", "language": 0}),
+            DISCOVERY_TIMEOUT,
+        )
+    except (aiohttp.ClientError, OSError, TimeoutError, ValueError):
+        return None
+    if not isinstance(status, dict) or status.get("comhead") != "get status":
+        # Some other web server
+        return None
+    return DiscoveredMatrix(
+        host=host,
+        model=str(status.get("model") or status.get("type") or "OREI Matrix"),
+        firmware=status.get("version") or status.get("firmware"),
+        mac=status.get("mac"),
+    )
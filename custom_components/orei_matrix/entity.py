@@ -0,0 +1,66 @@
+"""Base entity for the OREI Matrix integration."""
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import OreiMatrixCoordinator
+
+
+class OreiMatrixEntity(CoordinatorEntity[OreiMatrixCoordinator]):
+    """Common device info and stale-section handling for matrix entities."""
+
+    _attr_has_entity_name = True
+
+    # Status sections (SECTION_*) this entity's state is derived from
+    _sections: tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        coordinator: OreiMatrixCoordinator,
+        entry: ConfigEntry,
+        slices: tuple[tuple, ...] = (),
+    ) -> None:
+        """Subscribe to the coordinator for the given data slices.
+
+        ``slices`` are the coordinator data keys this entity renders, e.g.
+        ``("power",)`` or ``("routing", 3)``; the entity is only written when
+        one of them (or the stale flag of one of its sections) changes.
+        """
+        context = frozenset(slices) | {("stale", section) for section in self._sections}
+        super().__init__(coordinator, context)
+        self._entry = entry
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": self._entry.title,
+            "manufacturer": "OREI",
+            "configuration_url": f"http://{self._entry.data['host']}",
+        }
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the state is last-known data from a failed endpoint."""
+        return self.coordinator.is_stale(self._sections)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Flag last-known data while a dependent endpoint is failing."""
+        if self.stale:
+            return {"stale": True}
+        return None
+
+
+def get_output_name(
+    coordinator: OreiMatrixCoordinator, output_num: int, default: str
+) -> str:
+    """Get output name from coordinator data, ignoring default device names."""
+    if coordinator.data:
+        name = coordinator.data.output_name(output_num)
+        if name and not name.lower().startswith("hdmi output"):
+            return name
+    return default
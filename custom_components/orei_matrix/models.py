@@ -0,0 +1,126 @@
+"""Typed state model for the OREI Matrix integration."""
+
+from dataclasses import dataclass, fields, replace
+from itertools import zip_longest
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class MatrixState:
+    """Immutable snapshot of the matrix as last reported by the device.
+
+    Per-port fields are tuples indexed by ``port - 1``; use the accessor
+    methods for 1-based lookups. Being frozen and tuple-backed, two states
+    compare cheaply and a poll that changes nothing can be detected with a
+    single ``==``.
+    """
+
+    power: bool = False
+    # Input routed to each output (1-based input numbers)
+    routing: tuple[int, ...] = ()
+    input_names: tuple[str, ...] = ()
+    output_names: tuple[str, ...] = ()
+    preset_names: tuple[str, ...] = ()
+    input_active: tuple[bool, ...] = ()
+    output_connected: tuple[bool, ...] = ()
+    # Output stream enable, scaler mode and HDCP mode, as raw device values
+    output_stream: tuple[bool, ...] = ()
+    output_scaler: tuple[int, ...] = ()
+    output_hdcp: tuple[int, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MatrixState":
+        """Return a state from ``dataclasses.asdict`` output, e.g. from JSON.
+
+        Lists are turned back into tuples and unknown keys are ignored.
+        """
+        return cls(
+            **{
+                field.name: tuple(value) if isinstance(value, list) else value
+                for field in fields(cls)
+                if (value := data.get(field.name)) is not None
+            }
+        )
+
+    @property
+    def num_inputs(self) -> int:
+        """Return the number of inputs the device reports (0 if unknown)."""
+        return len(self.input_names) or max(self.routing, default=0)
+
+    @property
+    def num_outputs(self) -> int:
+        """Return the number of outputs the device reports (0 if unknown)."""
+        return len(self.routing) or len(self.output_names)
+
+    def route(self, output_num: int) -> int | None:
+        """Return the input routed to a 1-based output, if known."""
+        return _get(self.routing, output_num) or None
+
+    def input_name(self, input_num: int) -> str | None:
+        """Return the device name of a 1-based input, if known."""
+        return _get(self.input_names, input_num)
+
+    def output_name(self, output_num: int) -> str | None:
+        """Return the device name of a 1-based output, if known."""
+        return _get(self.output_names, output_num)
+
+    def is_input_active(self, input_num: int) -> bool | None:
+        """Return True if a 1-based input has an active signal."""
+        return _get(self.input_active, input_num)
+
+    def is_output_connected(self, output_num: int) -> bool | None:
+        """Return True if a 1-based output has a connected sink."""
+        return _get(self.output_connected, output_num)
+
+    def port_value(self, field: str, port: int):
+        """Return the 1-based entry of a per-port field, if known."""
+        return _get(getattr(self, field), port)
+
+    def with_route(self, output_num: int, input_num: int) -> "MatrixState":
+        """Return a copy with one output routed to a different input."""
+        routing = list(self.routing)
+        routing.extend([0] * (output_num - len(routing)))
+        routing[output_num - 1] = input_num
+        return replace(self, routing=tuple(routing))
+
+    def changed_slices(self, other: "MatrixState") -> set[tuple]:
+        """Return the slices that differ from ``other``.
+
+        Whole fields are reported as ``(field,)``; per-port fields port by
+        port as ``(field, port)``, e.g. ``{("routing", 2), ("power",)}``.
+        """
+        changed: set[tuple] = set()
+        if self == other:
+            return changed
+        for name in _SCALAR_FIELDS:
+            if getattr(self, name) != getattr(other, name):
+                changed.add((name,))
+        for name in _PORT_FIELDS:
+            before = getattr(other, name)
+            after = getattr(self, name)
+            if before == after:
+                continue
+            for idx, (old, new) in enumerate(zip_longest(before, after)):
+                if old != new:
+                    changed.add((name, idx + 1))
+        return changed
+
+
+_PORT_FIELDS = (
+    "routing",
+    "input_active",
+    "output_connected",
+    "output_stream",
+    "output_scaler",
+    "output_hdcp",
+)
+_SCALAR_FIELDS = tuple(
+    field.name for field in fields(MatrixState) if field.name not in _PORT_FIELDS
+)
+
+
+def _get(values: tuple, port: int):
+    """Return the 1-based entry of a per-port tuple, or None."""
+    if 0 < port <= len(values):
+        return values[port - 1]
+    return None
@@ -2,9 +2,18 @@
  * OREI Matrix Card — Custom Lovelace card for OREI HDMI/HDBaseT matrix switcher.
  *
  * Two views: Matrix Grid and List. Power toggle and preset buttons at top.
+ *
+ * Matrix state comes from the integration's websocket feed
+ * (orei_matrix/layout + orei_matrix/subscribe). Against an older
+ * integration without it, the card falls back to scanning hass.states.
  */
 
-const CARD_VERSION = "1.2.2";
+const CARD_VERSION = "1.3.0";
+
+// After the integration ends the feed (its entry reloads), subscribe again
+// every FEED_RETRY_DELAY ms, up to FEED_RETRIES times, before scanning states
+const FEED_RETRY_DELAY = 2000;
+const FEED_RETRIES = 5;
 
 class OreiMatrixCard extends HTMLElement {
   constructor() {
@@ -14,20 +23,43 @@ class OreiMatrixCard extends HTMLElement {
     this._built = false;
     this._lastStateHash = "";
     this._entityCache = null;
+    this._numInputs = 4;
+    // Websocket feed: idle -> connecting -> live, or unavailable (fallback)
+    this._feedState = "idle";
+    this._feed = null;
+    this._unsubFeed = null;
+    this._feedGeneration = 0;
+    this._feedRetries = 0;
+    this._retryTimer = null;
+    this._labelHash = "";
   }
 
   setConfig(config) {
     this._config = {
       title: config.title || "OREI Matrix",
       entity_prefix: config.entity_prefix || "orei_matrix",
-      num_inputs: config.num_inputs || 4,
-      num_outputs: config.num_outputs || 4,
+      // Matrix size is detected from the entities unless set explicitly
+      num_inputs: config.num_inputs || 0,
+      num_outputs: config.num_outputs || 0,
       show_signal: config.show_signal !== false,
+      // Config entry of the matrix; only needed with several matrices
+      entry_id: config.entry_id || null,
       ...config,
     };
+    this._disconnectFeed();
+    this._feedState = "idle";
+    this._entityCache = null;
     this._built = false;
   }
 
+  disconnectedCallback() {
+    this._disconnectFeed();
+    if (this._frame) {
+      cancelAnimationFrame(this._frame);
+      this._frame = null;
+    }
+  }
+
   static getStubConfig() {
     return { title: "OREI Matrix" };
   }
@@ -35,7 +67,23 @@ class OreiMatrixCard extends HTMLElement {
   set hass(hass) {
     this._hass = hass;
 
-    // Discover entities once
+    if (this._feedState === "idle") {
+      this._connectFeed();
+    }
+    if (this._feedState === "connecting") return;
+    if (this._feedState === "live") {
+      // State comes from the feed; hass only matters for renamed entities
+      if (!this._built) {
+        this._buildDom();
+        this._built = true;
+        this._updateDom();
+      } else if (this._labelsChanged()) {
+        this._scheduleUpdate();
+      }
+      return;
+    }
+
+    // Fallback: discover entities once
     if (!this._entityCache) {
       this._discoverEntities();
     }
@@ -50,8 +98,134 @@ class OreiMatrixCard extends HTMLElement {
     const hash = this._computeStateHash();
     if (hash !== this._lastStateHash) {
       this._lastStateHash = hash;
-      this._updateDom();
+      this._scheduleUpdate();
+    }
+  }
+
+  // ── Websocket feed ───────────────────────────────────────────
+
+  async _connectFeed() {
+    const generation = ++this._feedGeneration;
+    this._feedState = "connecting";
+    const entryId = this._config.entry_id;
+    try {
+      const layout = await this._hass.callWS({
+        type: "orei_matrix/layout",
+        ...(entryId ? { entry_id: entryId } : {}),
+      });
+      const unsub = await this._hass.connection.subscribeMessage(
+        (msg) => this._onFeed(msg),
+        { type: "orei_matrix/subscribe", entry_id: layout.entry_id }
+      );
+      if (generation !== this._feedGeneration) {
+        unsub();
+        return;
+      }
+      this._unsubFeed = unsub;
+      this._applyLayout(layout);
+      this._feedState = "live";
+      this._feedRetries = 0;
+    } catch (err) {
+      if (generation !== this._feedGeneration) return;
+      if (this._feedRetries > 0) {
+        this._reconnectFeed(this._feedRetries - 1);
+        return;
+      }
+      console.debug("OREI card: websocket feed unavailable, scanning states", err);
+      this._feedState = "unavailable";
+      this._feed = null;
+      this._entityCache = null;
+    }
+    this._built = false;
+    this._lastStateHash = "";
+    if (this._hass) this.hass = this._hass;
+  }
+
+  _reconnectFeed(retries) {
+    // Keep showing the last state until the feed is back
+    this._disconnectFeed();
+    this._feedState = "connecting";
+    this._feedRetries = retries;
+    this._retryTimer = setTimeout(() => {
+      this._retryTimer = null;
+      this._connectFeed();
+    }, FEED_RETRY_DELAY);
+  }
+
+  _disconnectFeed() {
+    this._feedGeneration++;
+    if (this._retryTimer) {
+      clearTimeout(this._retryTimer);
+      this._retryTimer = null;
+    }
+    if (this._unsubFeed) {
+      this._unsubFeed();
+      this._unsubFeed = null;
+    }
+    if (this._feedState !== "unavailable") {
+      this._feedState = "idle";
+    }
+    this._feed = null;
+    this._built = false;
+  }
+
+  _applyLayout(layout) {
+    const byNum = (map) =>
+      Object.entries(map || {})
+        .map(([num, id]) => ({ id, num: Number(num) }))
+        .sort((a, b) => a.num - b.num);
+    const maxOutputs = this._config.num_outputs;
+    this._entityCache = {
+      power: layout.entities.power ? { id: layout.entities.power } : null,
+      outputs: byNum(layout.entities.outputs).filter(
+        (out) => !maxOutputs || out.num <= maxOutputs
+      ),
+      inputSignals: byNum(layout.entities.input_signals),
+      presets: byNum(layout.entities.presets),
+    };
+    this._numInputs = this._config.num_inputs || layout.num_inputs || 4;
+    this._labelHash = "";
+  }
+
+  _onFeed(msg) {
+    if (msg.closed) {
+      // The matrix's config entry unloaded, e.g. to apply new options
+      this._reconnectFeed(FEED_RETRIES);
+      return;
+    }
+    if (msg.full) {
+      this._feed = msg.full;
+    } else if (msg.changes && this._feed) {
+      // Per-port fields arrive as {port: value} holding only changed ports
+      for (const [key, value] of Object.entries(msg.changes)) {
+        const current = this._feed[key];
+        if (Array.isArray(current) && value && !Array.isArray(value) && typeof value === "object") {
+          const next = current.slice();
+          for (const [port, portValue] of Object.entries(value)) {
+            next[Number(port) - 1] = portValue;
+          }
+          while (next.length && next[next.length - 1] == null) next.pop();
+          this._feed[key] = next;
+        } else {
+          this._feed[key] = value;
+        }
+      }
     }
+    if (this._built && this._feedState === "live") {
+      this._scheduleUpdate();
+    }
+  }
+
+  _labelsChanged() {
+    // Output and preset labels use entity names, which users can rename
+    const parts = [];
+    for (const item of [...this._entityCache.outputs, ...this._entityCache.presets]) {
+      parts.push(this._getState(item.id)?.attributes?.friendly_name || "?");
+    }
+    const hash = parts.join(",");
+    if (hash === this._labelHash) return false;
+    this._labelHash = hash;
+    return true;
   }
 
   // ── Entity discovery (runs once) ─────────────────────────────
@@ -63,6 +237,7 @@ class OreiMatrixCard extends HTMLElement {
       power: null,
       outputs: [],
       inputSignals: [],
+      presets: [],
     };
 
     // Power switch
@@ -73,16 +248,17 @@ class OreiMatrixCard extends HTMLElement {
       }
     }
 
-    // Output select entities
-    for (let i = 1; i <= this._config.num_outputs; i++) {
-      const regex = new RegExp(`^select\\..*orei.*output_?${i}$`);
-      for (const [id, e] of Object.entries(this._hass.states)) {
-        if (regex.test(id)) {
-          this._entityCache.outputs.push({ id, num: i });
-          break;
+    // Output select entities (tagged with an output_number attribute)
+    const maxOutputs = this._config.num_outputs;
+    for (const [id, e] of Object.entries(this._hass.states)) {
+      const num = e.attributes?.output_number;
+      if (id.startsWith("select.") && id.includes("orei") && num) {
+        if (!maxOutputs || num <= maxOutputs) {
+          this._entityCache.outputs.push({ id, num });
         }
       }
     }
+    this._entityCache.outputs.sort((a, b) => a.num - b.num);
     // Fallback: find all orei select entities
     if (this._entityCache.outputs.length === 0) {
       for (const [id, e] of Object.entries(this._hass.states)) {
@@ -92,16 +268,44 @@ class OreiMatrixCard extends HTMLElement {
       }
     }
 
-    // Input signal sensors
-    for (let i = 1; i <= this._config.num_inputs; i++) {
-      const regex = new RegExp(`^binary_sensor\\..*orei.*input_?${i}_?signal$`);
-      for (const [id, e] of Object.entries(this._hass.states)) {
-        if (regex.test(id)) {
-          this._entityCache.inputSignals.push({ id, num: i });
-          break;
-        }
+    // Number of inputs: explicit config, else the size of the source list
+    const firstOut = this._entityCache.outputs.length
+      ? this._getState(this._entityCache.outputs[0].id)
+      : null;
+    this._numInputs =
+      this._config.num_inputs || firstOut?.attributes?.options?.length || 4;
+
+    // Input signal sensors (one pass over all states)
+    const signalRegex = /^binary_sensor\..*orei.*input_?(\d+)_?signal$/;
+    const seenInputs = new Set();
+    for (const id of Object.keys(this._hass.states)) {
+      const match = signalRegex.exec(id);
+      if (!match) continue;
+      const num = parseInt(match[1], 10);
+      if (num <= this._numInputs && !seenInputs.has(num)) {
+        seenInputs.add(num);
+        this._entityCache.inputSignals.push({ id, num });
+      }
+    }
+
+    // Output connection sensors, matched to the outputs found above
+    const outputSignalRegex = /^binary_sensor\..*orei.*output_?(\d+)_?signal$/;
+    for (const id of Object.keys(this._hass.states)) {
+      const match = outputSignalRegex.exec(id);
+      if (!match) continue;
+      const out = this._entityCache.outputs.find(
+        (o) => o.num === parseInt(match[1], 10)
+      );
+      if (out && !out.signal) out.signal = id;
+    }
+
+    // Preset recall buttons (tagged with a preset_number attribute)
+    for (const [id, e] of Object.entries(this._hass.states)) {
+      if (id.startsWith("button.") && id.includes("orei") && e.attributes?.preset_number) {
+        this._entityCache.presets.push({ id, num: e.attributes.preset_number });
       }
     }
+    this._entityCache.presets.sort((a, b) => a.num - b.num);
 
     console.debug("OREI card entities:", this._entityCache);
   }
@@ -121,11 +325,16 @@ class OreiMatrixCard extends HTMLElement {
     for (const out of this._entityCache.outputs) {
       const s = this._getState(out.id);
       parts.push(s ? s.state : "?");
+      if (out.signal) parts.push(this._getState(out.signal)?.state || "?");
     }
     for (const sig of this._entityCache.inputSignals) {
       const s = this._getState(sig.id);
       parts.push(s ? s.state : "?");
     }
+    for (const preset of this._entityCache.presets) {
+      const s = this._getState(preset.id);
+      parts.push(s?.attributes?.friendly_name || "?");
+    }
     return parts.join(",");
   }
 
@@ -138,6 +347,12 @@ class OreiMatrixCard extends HTMLElement {
     });
   }
 
+  _recallPreset(presetEntityId) {
+    this._hass.callService("button", "press", {
+      entity_id: presetEntityId,
+    });
+  }
+
   _selectSource(outputEntityId, sourceName) {
     this._hass.callService("select", "select_option", {
       entity_id: outputEntityId,
@@ -152,6 +367,20 @@ class OreiMatrixCard extends HTMLElement {
     const root = this.shadowRoot;
     root.innerHTML = "";
 
+    // Elements keyed by input/output number; _rendered holds the value
+    // last written to each, so updates only touch what changed
+    this._els = {
+      inputNames: new Map(),
+      inputSignals: new Map(),
+      outputNames: new Map(),
+      cells: new Map(),
+      selects: new Map(),
+      options: new Map(),
+      outputSignals: new Map(),
+      presets: new Map(),
+    };
+    this._rendered = new Map();
+
     const style = document.createElement("style");
     style.textContent = this._styles();
     root.appendChild(style);
@@ -162,51 +391,85 @@ class OreiMatrixCard extends HTMLElement {
     // Header
     const header = document.createElement("div");
     header.className = "card-header";
-    header.innerHTML = `
-      <span class="title">${this._config.title}</span>
-      <div class="header-controls">
-        <button class="view-toggle" id="viewToggle">
-          ${this._view === "grid" ? "☰ List" : "▦ Grid"}
-        </button>
-        <button class="power-btn" id="powerBtn">⏻</button>
-      </div>
-    `;
-    card.appendChild(header);
-
-    header.querySelector("#viewToggle").addEventListener("click", () => {
+    const title = document.createElement("span");
+    title.className = "title";
+    title.textContent = this._config.title;
+    header.appendChild(title);
+
+    const controls = document.createElement("div");
+    controls.className = "header-controls";
+    const viewToggle = document.createElement("button");
+    viewToggle.className = "view-toggle";
+    viewToggle.addEventListener("click", () => {
       this._view = this._view === "grid" ? "list" : "grid";
-      this._built = false;
-      this._lastStateHash = "";
-      this._buildDom();
-      this._updateDom();
+      this._applyView();
+      this._scheduleUpdate();
     });
+    controls.appendChild(viewToggle);
+    this._els.viewToggle = viewToggle;
 
-    header.querySelector("#powerBtn").addEventListener("click", () => {
+    const powerBtn = document.createElement("button");
+    powerBtn.className = "power-btn";
+    powerBtn.textContent = "⏻";
+    powerBtn.addEventListener("click", () => {
       this._togglePower();
     });
+    controls.appendChild(powerBtn);
+    this._els.power = powerBtn;
+    header.appendChild(controls);
+    card.appendChild(header);
+
+    // Preset buttons
+    const presets = this._entityCache?.presets || [];
+    if (presets.length > 0) {
+      const presetRow = document.createElement("div");
+      presetRow.className = "preset-row";
+      for (const preset of presets) {
+        const btn = document.createElement("button");
+        btn.className = "preset-btn";
+        btn.textContent = `Preset ${preset.num}`;
+        btn.addEventListener("click", () => {
+          this._recallPreset(preset.id);
+        });
+        presetRow.appendChild(btn);
+        this._els.presets.set(preset.num, btn);
+      }
+      card.appendChild(presetRow);
+    }
 
-    // Content
+    // Content: both views are built once and toggled with `hidden`
     const content = document.createElement("div");
     content.className = "card-content";
-    content.id = "content";
     card.appendChild(content);
 
-    // Build grid or list
-    if (this._view === "grid") {
-      this._buildGrid(content);
+    if (!this._entityCache?.outputs.length) {
+      const empty = document.createElement("div");
+      empty.className = "empty";
+      empty.textContent = "No output entities found";
+      content.appendChild(empty);
     } else {
-      this._buildList(content);
+      this._els.grid = this._buildGrid(content);
+      this._els.list = this._buildList(content);
     }
+    this._applyView();
   }
 
-  _buildGrid(container) {
-    const outputs = this._entityCache?.outputs || [];
-    const numInputs = this._config.num_inputs;
+  _applyView() {
+    const isGrid = this._view === "grid";
+    if (this._els.grid) this._els.grid.hidden = !isGrid;
+    if (this._els.list) this._els.list.hidden = isGrid;
+    this._els.viewToggle.textContent = isGrid ? "☰ List" : "▦ Grid";
+  }
 
-    if (outputs.length === 0) {
-      container.innerHTML += '<div class="empty">No output entities found</div>';
-      return;
-    }
+  _addOutputName(outputNum, el) {
+    const names = this._els.outputNames.get(outputNum) || [];
+    names.push(el);
+    this._els.outputNames.set(outputNum, names);
+  }
+
+  _buildGrid(container) {
+    const outputs = this._entityCache.outputs;
+    const numInputs = this._numInputs;
 
     const table = document.createElement("table");
     const wrapper = document.createElement("div");
@@ -222,13 +485,13 @@ class OreiMatrixCard extends HTMLElement {
       if (this._config.show_signal) {
         const dot = document.createElement("span");
         dot.className = "signal-dot";
-        dot.id = `input-signal-${i}`;
         th.appendChild(dot);
+        this._els.inputSignals.set(i, dot);
       }
       const label = document.createElement("span");
-      label.id = `input-name-${i}`;
       label.textContent = `Input ${i}`;
       th.appendChild(label);
+      this._els.inputNames.set(i, label);
       headerRow.appendChild(th);
     }
     thead.appendChild(headerRow);
@@ -240,35 +503,37 @@ class OreiMatrixCard extends HTMLElement {
       const tr = document.createElement("tr");
       const labelTd = document.createElement("td");
       labelTd.className = "row-label";
-      labelTd.id = `output-name-${out.num}`;
       labelTd.textContent = `Output ${out.num}`;
       tr.appendChild(labelTd);
+      this._addOutputName(out.num, labelTd);
 
       for (let i = 1; i <= numInputs; i++) {
         const td = document.createElement("td");
         const cell = document.createElement("div");
         cell.className = "grid-cell";
-        cell.id = `cell-${out.num}-${i}`;
         cell.textContent = "○";
-        cell.addEventListener("click", () => {
-          this._selectSource(out.id, this._getInputName(i));
-        });
+        cell.dataset.entity = out.id;
+        cell.dataset.input = i;
         td.appendChild(cell);
         tr.appendChild(td);
+        this._els.cells.set(`${out.num}-${i}`, cell);
       }
       tbody.appendChild(tr);
     }
     table.appendChild(tbody);
+
+    // One delegated listener for every cell
+    table.addEventListener("click", (e) => {
+      const cell = e.target.closest(".grid-cell");
+      if (!cell) return;
+      this._selectSource(cell.dataset.entity, this._getInputName(Number(cell.dataset.input)));
+    });
     container.appendChild(wrapper);
+    return wrapper;
   }
 
   _buildList(container) {
-    const outputs = this._entityCache?.outputs || [];
-
-    if (outputs.length === 0) {
-      container.innerHTML += '<div class="empty">No output entities found</div>';
-      return;
-    }
+    const outputs = this._entityCache.outputs;
 
     const listDiv = document.createElement("div");
     listDiv.className = "list-view";
@@ -279,9 +544,9 @@ class OreiMatrixCard extends HTMLElement {
 
       const label = document.createElement("span");
       label.className = "list-label";
-      label.id = `list-output-name-${out.num}`;
       label.textContent = `Output ${out.num}`;
       row.appendChild(label);
+      this._addOutputName(out.num, label);
 
       const arrow = document.createElement("span");
       arrow.className = "list-arrow";
@@ -290,29 +555,32 @@ class OreiMatrixCard extends HTMLElement {
 
       const select = document.createElement("select");
       select.className = "source-select";
-      select.id = `list-select-${out.num}`;
-      for (let i = 1; i <= this._config.num_inputs; i++) {
+      const options = [];
+      for (let i = 1; i <= this._numInputs; i++) {
         const opt = document.createElement("option");
-        opt.id = `list-opt-${out.num}-${i}`;
         opt.value = `input${i}`;
         opt.textContent = `Input ${i}`;
         select.appendChild(opt);
+        options.push(opt);
       }
       select.addEventListener("change", (e) => {
         this._selectSource(out.id, e.target.value);
       });
       row.appendChild(select);
+      this._els.selects.set(out.num, select);
+      this._els.options.set(out.num, options);
 
       if (this._config.show_signal) {
         const dot = document.createElement("span");
         dot.className = "signal-dot";
-        dot.id = `list-output-signal-${out.num}`;
         row.appendChild(dot);
+        this._els.outputSignals.set(out.num, dot);
       }
 
       listDiv.appendChild(row);
     }
     container.appendChild(listDiv);
+    return listDiv;
   }
 
   // ── Update DOM (runs on state change, no innerHTML) ──────────
@@ -343,111 +611,162 @@ class OreiMatrixCard extends HTMLElement {
     return `Output ${outputNum}`;
   }
 
+  _presetLabel(friendlyName, presetNum) {
+    // friendly_name is "<device name> <preset name>"; keep the preset name
+    if (!friendlyName) return `Preset ${presetNum}`;
+    const parts = friendlyName.split(/\)\s*/);
+    const tail = parts[parts.length - 1].trim();
+    return tail || `Preset ${presetNum}`;
+  }
+
   _getInputName(inputNum) {
-    if (!this._entityCache?.outputs.length) return `input${inputNum}`;
-    const firstOut = this._getState(this._entityCache.outputs[0].id);
-    if (firstOut?.attributes?.options) {
-      const list = firstOut.attributes.options;
-      if (inputNum <= list.length) return list[inputNum - 1];
+    return this._inputNames()[inputNum - 1] || `input${inputNum}`;
+  }
+
+  // ── State accessors: websocket feed when live, entity states otherwise ──
+
+  _isPowerOn() {
+    if (this._feed) return this._feed.available !== false && !!this._feed.power;
+    const pw = this._entityCache.power ? this._getState(this._entityCache.power.id) : null;
+    return !!pw && pw.state === "on";
+  }
+
+  _inputNames() {
+    let names = [];
+    if (this._feed) {
+      names = this._feed.input_names || [];
+    } else if (this._entityCache?.outputs.length) {
+      names = this._getState(this._entityCache.outputs[0].id)?.attributes?.options || [];
+    }
+    if (names.length) return names;
+    return Array.from({ length: this._numInputs }, (_, i) => `input${i + 1}`);
+  }
+
+  _isInputActive(sig) {
+    if (this._feed) return !!this._feed.input_active?.[sig.num - 1];
+    return this._getState(sig.id)?.state === "on";
+  }
+
+  _currentSource(out, inputNames) {
+    if (this._feed) {
+      const input = this._feed.routing?.[out.num - 1];
+      return input ? inputNames[input - 1] : undefined;
     }
-    return `input${inputNum}`;
+    return this._getState(out.id)?.state;
+  }
+
+  _isOutputConnected(out) {
+    if (this._feed) return !!this._feed.output_connected?.[out.num - 1];
+    // Output connection sensor; older versions had it on the select
+    if (out.signal) return this._getState(out.signal)?.state === "on";
+    return !!this._getState(out.id)?.attributes?.signal_connected;
+  }
+
+  _scheduleUpdate() {
+    // Coalesce bursts of feed and hass updates into one patch per frame
+    if (this._frame) return;
+    this._frame = requestAnimationFrame(() => {
+      this._frame = null;
+      this._updateDom();
+    });
+  }
+
+  _patch(key, value, apply) {
+    if (this._rendered.get(key) === value) return;
+    this._rendered.set(key, value);
+    apply(value);
   }
 
   _updateDom() {
-    if (!this._hass || !this._entityCache) return;
+    if (!this._hass || !this._entityCache || !this._els) return;
 
     const root = this.shadowRoot;
+    const els = this._els;
 
     // Power button
-    const powerBtn = root.getElementById("powerBtn");
-    if (powerBtn && this._entityCache.power) {
-      const pw = this._getState(this._entityCache.power.id);
-      const isOn = pw && pw.state === "on";
-      powerBtn.className = `power-btn ${isOn ? "on" : "off"}`;
-      powerBtn.textContent = `⏻ ${isOn ? "ON" : "OFF"}`;
+    const isPowerOn = this._isPowerOn();
+    if (this._entityCache.power) {
+      this._patch("power", isPowerOn, (on) => {
+        els.power.className = `power-btn ${on ? "on" : "off"}`;
+        els.power.textContent = `⏻ ${on ? "ON" : "OFF"}`;
+      });
     }
 
-    // Get input names from first output entity's options
-    const inputNames = [];
-    if (this._entityCache.outputs.length > 0) {
-      const firstOut = this._getState(this._entityCache.outputs[0].id);
-      if (firstOut?.attributes?.options) {
-        inputNames.push(...firstOut.attributes.options);
-      }
-    }
-    if (inputNames.length === 0) {
-      for (let i = 1; i <= this._config.num_inputs; i++) {
-        inputNames.push(`input${i}`);
-      }
-    }
+    const inputNames = this._inputNames();
 
-    // Update input name labels
-    for (let i = 1; i <= this._config.num_inputs; i++) {
-      const label = root.getElementById(`input-name-${i}`);
-      if (label) label.textContent = inputNames[i - 1] || `Input ${i}`;
+    // Input name labels
+    for (const [i, label] of els.inputNames) {
+      this._patch(`input-name-${i}`, inputNames[i - 1] || `Input ${i}`, (text) => {
+        label.textContent = text;
+      });
     }
 
-    // Update input signal dots
+    // Input signal dots
     for (const sig of this._entityCache.inputSignals) {
-      const dot = root.getElementById(`input-signal-${sig.num}`);
-      if (dot) {
-        const s = this._getState(sig.id);
-        dot.className = `signal-dot ${s && s.state === "on" ? "active" : "inactive"}`;
-      }
+      const dot = els.inputSignals.get(sig.num);
+      if (!dot) continue;
+      this._patch(`input-signal-${sig.num}`, this._isInputActive(sig), (active) => {
+        dot.className = `signal-dot ${active ? "active" : "inactive"}`;
+      });
     }
 
-    // Power state for disabling controls
-    const pwState = this._entityCache.power ? this._getState(this._entityCache.power.id) : null;
-    const isPowerOn = pwState && pwState.state === "on";
+    // Preset button labels
+    for (const preset of this._entityCache.presets) {
+      const btn = els.presets.get(preset.num);
+      const s = this._getState(preset.id);
+      this._patch(`preset-${preset.num}`, this._presetLabel(s?.attributes?.friendly_name, preset.num), (text) => {
+        btn.textContent = text;
+      });
+    }
 
-    // Update outputs
+    // Outputs
     for (const out of this._entityCache.outputs) {
       const s = this._getState(out.id);
-      const currentSource = s?.state;
+      const currentSource = this._currentSource(out, inputNames);
       // Use just the entity's own name, not the full friendly_name which
       // includes the device name prefix. Fall back to "Output N".
-      const friendlyName = s?.attributes?.friendly_name || "";
-      const outName = this._shortName(friendlyName, out.num);
-
-      // Output name labels
-      const nameEl = root.getElementById(`output-name-${out.num}`);
-      if (nameEl) nameEl.textContent = outName;
-      const listNameEl = root.getElementById(`list-output-name-${out.num}`);
-      if (listNameEl) listNameEl.textContent = outName;
+      const outName = this._shortName(s?.attributes?.friendly_name || "", out.num);
+      this._patch(`output-name-${out.num}`, outName, (text) => {
+        for (const el of els.outputNames.get(out.num) || []) el.textContent = text;
+      });
 
+      // Only the visible view is patched; the other catches up when shown
       if (this._view === "grid") {
-        // Update grid cells
-        for (let i = 1; i <= this._config.num_inputs; i++) {
-          const cell = root.getElementById(`cell-${out.num}-${i}`);
-          if (cell) {
-            const isActive = currentSource === inputNames[i - 1];
-            cell.className = `grid-cell ${isActive ? "active" : ""} ${!isPowerOn ? "disabled" : ""}`;
+        for (let i = 1; i <= this._numInputs; i++) {
+          const cell = els.cells.get(`${out.num}-${i}`);
+          if (!cell) continue;
+          const isActive = currentSource === inputNames[i - 1];
+          const cls = `grid-cell ${isActive ? "active" : ""} ${!isPowerOn ? "disabled" : ""}`;
+          this._patch(`cell-${out.num}-${i}`, cls, () => {
+            cell.className = cls;
             cell.textContent = isActive ? "●" : "○";
-          }
+          });
         }
       } else {
-        // Update list dropdowns — only update if dropdown is not focused
-        const select = root.getElementById(`list-select-${out.num}`);
+        // Dropdowns — only update if not focused
+        const select = els.selects.get(out.num);
         if (select && document.activeElement !== select && root.activeElement !== select) {
-          select.disabled = !isPowerOn;
-          // Update option labels
-          for (let i = 1; i <= this._config.num_inputs; i++) {
-            const opt = root.getElementById(`list-opt-${out.num}-${i}`);
-            if (opt) {
-              opt.value = inputNames[i - 1] || `input${i}`;
-              opt.textContent = inputNames[i - 1] || `Input ${i}`;
-              opt.selected = (inputNames[i - 1] === currentSource);
-            }
-          }
+          this._patch(`list-disabled-${out.num}`, !isPowerOn, (disabled) => {
+            select.disabled = disabled;
+          });
+          els.options.get(out.num).forEach((opt, idx) => {
+            const name = inputNames[idx];
+            this._patch(`list-opt-${out.num}-${idx + 1}`, name ?? "", () => {
+              opt.value = name || `input${idx + 1}`;
+              opt.textContent = name || `Input ${idx + 1}`;
+            });
+          });
+          // Compared with the DOM, which the user may have changed
+          const index = currentSource === undefined ? -1 : inputNames.indexOf(currentSource);
+          if (select.selectedIndex !== index) select.selectedIndex = index;
         }
 
         // Output signal dot
-        if (this._config.show_signal) {
-          const dot = root.getElementById(`list-output-signal-${out.num}`);
-          if (dot) {
-            const connected = s?.attributes?.signal_connected;
+        const dot = els.outputSignals.get(out.num);
+        if (dot) {
+          this._patch(`output-signal-${out.num}`, this._isOutputConnected(out), (connected) => {
             dot.className = `signal-dot ${connected ? "active" : "inactive"}`;
-          }
+          });
         }
       }
     }
@@ -466,6 +785,10 @@ class OreiMatrixCard extends HTMLElement {
         padding: 0;
       }
 
+      [hidden] {
+        display: none !important;
+      }
+
       .card-header {
         display: flex;
         justify-content: space-between;
@@ -509,6 +832,13 @@ class OreiMatrixCard extends HTMLElement {
         border-color: var(--inactive-color);
       }
 
+      .preset-row {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 6px;
+        padding: 0 16px 8px;
+      }
+
       .card-content {
         padding: 0 16px 16px;
       }
@@ -0,0 +1,98 @@
+"""Fleet-wide poll scheduler shared by all OREI Matrix config entries."""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_SCHEDULER, FLEET_MAX_CONCURRENT_REQUESTS
+
+if TYPE_CHECKING:
+    from .coordinator import OreiMatrixCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OreiMatrixFleetScheduler:
+    """Spread polls across matrices and cap device requests in flight.
+
+    Every coordinator is given a phase on a shared time grid so that, after
+    a restart, matrices are polled evenly across the interval instead of in
+    lockstep. Every client takes a slot from :meth:`request_slot` around
+    each device request, which bounds concurrent requests fleet-wide.
+    """
+
+    def __init__(self, max_concurrent: int = FLEET_MAX_CONCURRENT_REQUESTS) -> None:
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._coordinators: dict[str, OreiMatrixCoordinator] = {}
+        # Origin of the shared grid that coordinator phases are measured from
+        self.epoch = time.monotonic()
+        self._waiting = 0
+        self._in_flight = 0
+
+    @property
+    def waiting(self) -> int:
+        """Return the number of requests waiting for a fleet slot."""
+        return self._waiting
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of device requests currently in flight."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Return all requests not yet sent, across every matrix."""
+        return self._waiting + sum(
+            coordinator.client.queue_depth
+            for coordinator in self._coordinators.values()
+        )
+
+    @asynccontextmanager
+    async def request_slot(self) -> AsyncIterator[None]:
+        """Hold one of the fleet-wide request slots."""
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    @callback
+    def async_register(
+        self, entry_id: str, coordinator: "OreiMatrixCoordinator"
+    ) -> None:
+        """Add a coordinator and re-spread every coordinator's phase."""
+        self._coordinators[entry_id] = coordinator
+        self._async_spread()
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        """Remove a coordinator and re-spread the remaining phases."""
+        if self._coordinators.pop(entry_id, None) is not None:
+            self._async_spread()
+
+    @callback
+    def _async_spread(self) -> None:
+        """Give each coordinator an evenly spaced phase in [0, 1)."""
+        count = len(self._coordinators)
+        for idx, entry_id in enumerate(sorted(self._coordinators)):
+            self._coordinators[entry_id].async_set_phase(self.epoch, idx / count)
+        _LOGGER.debug("Spread polling of %d OREI matrices", count)
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> OreiMatrixFleetScheduler:
+    """Return the scheduler shared by all entries, creating it on first use."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = OreiMatrixFleetScheduler()
+    return scheduler
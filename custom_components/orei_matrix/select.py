@@ -1,16 +1,16 @@
 """Select entities for OREI Matrix output source selection."""
 
-import asyncio
 import logging
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, NUM_OUTPUTS
+from .const import DOMAIN, SECTION_VIDEO
 from .coordinator import OreiMatrixCoordinator
+from .entity import OreiMatrixEntity, get_output_name
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,30 +23,20 @@ async def async_setup_entry(
     coordinator: OreiMatrixCoordinator = data["coordinator"]
 
     entities = []
-    for i in range(1, NUM_OUTPUTS + 1):
-        name = _get_output_name(coordinator, i, f"Output {i}")
+    for i in range(1, coordinator.num_outputs + 1):
+        name = get_output_name(coordinator, i, f"Output {i}")
         entities.append(OreiMatrixOutputSelect(coordinator, entry, i, name))
 
     async_add_entities(entities)
 
 
-def _get_output_name(
-    coordinator: OreiMatrixCoordinator, output_num: int, default: str
-) -> str:
-    """Get output name from coordinator data, ignoring default device names."""
-    if coordinator.data:
-        names = coordinator.data.get("output_names", {})
-        name = names.get(output_num, "")
-        if name and not name.lower().startswith("hdmi output"):
-            return name
-    return default
-
-
-class OreiMatrixOutputSelect(CoordinatorEntity[OreiMatrixCoordinator], SelectEntity):
+class OreiMatrixOutputSelect(OreiMatrixEntity, SelectEntity):
     """Select entity representing one matrix output — pick which input it receives."""
 
-    _attr_has_entity_name = True
     _attr_icon = "mdi:video-input-hdmi"
+    _sections = (SECTION_VIDEO,)
+    # Fixed per entity; not worth a copy in every recorded state
+    _unrecorded_attributes = frozenset({"output_number"})
 
     def __init__(
         self,
@@ -55,42 +45,29 @@ class OreiMatrixOutputSelect(CoordinatorEntity[OreiMatrixCoordinator], SelectEnt
         output_num: int,
         name: str,
     ) -> None:
-        super().__init__(coordinator)
-        self._entry = entry
+        super().__init__(
+            coordinator, entry, (("routing", output_num), ("input_names",))
+        )
         self._output_num = output_num
         self._attr_name = name
         self._attr_unique_id = f"{entry.entry_id}_output_{output_num}"
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": self._entry.title,
-            "manufacturer": "OREI",
-            "configuration_url": f"http://{self._entry.data['host']}",
-        }
-
     @property
     def options(self) -> list[str]:
         """Return list of available input names."""
-        if self.coordinator.data is None:
-            return [f"Input {i}" for i in range(1, 5)]
-        input_names = self.coordinator.data.get("input_names", {})
-        if input_names:
-            return [input_names[k] for k in sorted(input_names)]
-        return [f"Input {i}" for i in range(1, 5)]
+        if self.coordinator.data and self.coordinator.data.input_names:
+            return list(self.coordinator.data.input_names)
+        return [f"Input {i}" for i in range(1, self.coordinator.num_inputs + 1)]
 
     @property
     def current_option(self) -> str | None:
         """Return the name of the currently routed input."""
         if self.coordinator.data is None:
             return None
-        routing = self.coordinator.data.get("routing", {})
-        input_num = routing.get(self._output_num)
+        input_num = self.coordinator.data.route(self._output_num)
         if input_num is None:
             return None
-        input_names = self.coordinator.data.get("input_names", {})
-        return input_names.get(input_num, f"Input {input_num}")
+        return self.coordinator.data.input_name(input_num) or f"Input {input_num}"
 
     async def async_select_option(self, option: str) -> None:
         """Route the selected input to this output."""
@@ -103,25 +80,19 @@ class OreiMatrixOutputSelect(CoordinatorEntity[OreiMatrixCoordinator], SelectEnt
             "Switching output %d to input %d (%s)",
             self._output_num, input_num, option,
         )
-        resp = await self.coordinator.client.video_switch(input_num, self._output_num)
-        _LOGGER.debug("video switch response: %s", resp)
-
-        # Optimistic update
-        if self.coordinator.data:
-            self.coordinator.data["routing"][self._output_num] = input_num
-            self.async_write_ha_state()
-
-        await asyncio.sleep(0.5)
-        await self.coordinator.async_request_refresh()
+        errors = await self.coordinator.async_route({self._output_num: input_num})
+        if errors:
+            raise HomeAssistantError(
+                f"Failed to switch {self.name} to {option}: {errors[0]}"
+            ) from errors[0]
 
     def _resolve_input_num(self, source_name: str) -> int | None:
         """Resolve a source name to its 1-based input number."""
         if self.coordinator.data is None:
             return None
-        input_names = self.coordinator.data.get("input_names", {})
-        for num, name in input_names.items():
-            if name == source_name:
-                return num
+        input_names = self.coordinator.data.input_names
+        if source_name in input_names:
+            return input_names.index(source_name) + 1
         if source_name.startswith("Input "):
             try:
                 return int(source_name.split()[-1])
@@ -131,10 +102,8 @@ class OreiMatrixOutputSelect(CoordinatorEntity[OreiMatrixCoordinator], SelectEnt
 
     @property
     def extra_state_attributes(self) -> dict:
-        """Expose output connection status as an attribute."""
+        """Expose the output number so the card can find the select."""
         attrs = {"output_number": self._output_num}
-        if self.coordinator.data:
-            connected = self.coordinator.data.get("output_connected", {})
-            if self._output_num in connected:
-                attrs["signal_connected"] = connected[self._output_num]
+        if self.stale:
+            attrs["stale"] = True
         return attrs
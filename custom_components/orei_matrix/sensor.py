@@ -0,0 +1,176 @@
+"""Diagnostic sensor entities for OREI Matrix outputs and request performance."""
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, SECTION_OUTPUT
+from .coordinator import DIAGNOSTICS_SLICE, OreiMatrixCoordinator
+from .entity import OreiMatrixEntity, get_output_name
+from .stats import to_ms
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class OreiMatrixSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor and how to read its value."""
+
+    value_fn: Callable[[OreiMatrixCoordinator], float | None]
+
+
+@dataclass(frozen=True, kw_only=True)
+class OreiMatrixOutputSensorEntityDescription(SensorEntityDescription):
+    """Describes a per-output sensor read from ``get output status``."""
+
+    # Per-port MatrixState field holding the value
+    field: str
+
+
+def _percent(fraction: float | None) -> float | None:
+    """Convert a fraction to a rounded percentage."""
+    return None if fraction is None else round(fraction * 100, 1)
+
+
+SENSORS: tuple[OreiMatrixSensorEntityDescription, ...] = (
+    OreiMatrixSensorEntityDescription(
+        key="poll_latency_p50",
+        name="Poll latency p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: to_ms(coordinator.poll_latency(50)),
+    ),
+    OreiMatrixSensorEntityDescription(
+        key="poll_latency_p95",
+        name="Poll latency p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: to_ms(coordinator.poll_latency(95)),
+    ),
+    OreiMatrixSensorEntityDescription(
+        key="poll_failure_rate",
+        name="Poll failure rate",
+        icon="mdi:alert-circle-outline",
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda coordinator: _percent(coordinator.poll_failure_rate),
+    ),
+    OreiMatrixSensorEntityDescription(
+        key="command_latency",
+        name="Command latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: to_ms(coordinator.last_command_latency),
+    ),
+)
+
+
+# Raw device codes; the meaning of each value depends on the model
+OUTPUT_SENSORS: tuple[OreiMatrixOutputSensorEntityDescription, ...] = (
+    OreiMatrixOutputSensorEntityDescription(
+        key="scaler",
+        name="Scaler mode",
+        icon="mdi:resize",
+        field="output_scaler",
+    ),
+    OreiMatrixOutputSensorEntityDescription(
+        key="hdcp",
+        name="HDCP mode",
+        icon="mdi:shield-key-outline",
+        field="output_hdcp",
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the OREI Matrix diagnostic sensors."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: OreiMatrixCoordinator = data["coordinator"]
+    entities: list[SensorEntity] = [
+        OreiMatrixDiagnosticSensor(coordinator, entry, description)
+        for description in SENSORS
+    ]
+    for i in range(1, coordinator.num_outputs + 1):
+        name = get_output_name(coordinator, i, f"Output {i}")
+        entities.extend(
+            OreiMatrixOutputSensor(coordinator, entry, description, i, name)
+            for description in OUTPUT_SENSORS
+        )
+    async_add_entities(entities)
+
+
+class OreiMatrixDiagnosticSensor(OreiMatrixEntity, SensorEntity):
+    """Request performance of the matrix, updated after every poll.
+
+    Disabled by default; enable them while investigating a slow matrix.
+    """
+
+    entity_description: OreiMatrixSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: OreiMatrixCoordinator,
+        entry: ConfigEntry,
+        description: OreiMatrixSensorEntityDescription,
+    ) -> None:
+        super().__init__(coordinator, entry, (DIAGNOSTICS_SLICE,))
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        return self.entity_description.value_fn(self.coordinator)
+
+
+class OreiMatrixOutputSensor(OreiMatrixEntity, SensorEntity):
+    """Scaler or HDCP mode of one output, as the device's raw code.
+
+    Disabled by default: output status is only polled while an entity that
+    uses it is enabled.
+    """
+
+    entity_description: OreiMatrixOutputSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _sections = (SECTION_OUTPUT,)
+
+    def __init__(
+        self,
+        coordinator: OreiMatrixCoordinator,
+        entry: ConfigEntry,
+        description: OreiMatrixOutputSensorEntityDescription,
+        output_num: int,
+        output_name: str,
+    ) -> None:
+        super().__init__(coordinator, entry, ((description.field, output_num),))
+        self.entity_description = description
+        self._output_num = output_num
+        self._attr_name = f"{output_name} {description.name}"
+        self._attr_unique_id = (
+            f"{entry.entry_id}_output_{output_num}_{description.key}"
+        )
+
+    @property
+    def native_value(self) -> int | None:
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.port_value(
+            self.entity_description.field, self._output_num
+        )
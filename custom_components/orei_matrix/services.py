@@ -0,0 +1,156 @@
+"""Domain services for the OREI Matrix integration."""
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import (
+    ATTR_PRESET,
+    ATTR_ROUTING,
+    DOMAIN,
+    SERVICE_APPLY_ROUTING,
+    SERVICE_RECALL_PRESET,
+    SERVICE_SAVE_PRESET,
+)
+from .coordinator import OreiMatrixCoordinator
+from .models import MatrixState
+
+_LOGGER = logging.getLogger(__name__)
+
+_PORT = vol.Any(vol.Coerce(int), cv.string)
+
+APPLY_ROUTING_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DEVICE_ID): cv.string,
+    vol.Required(ATTR_ROUTING): vol.All({_PORT: _PORT}, vol.Length(min=1)),
+})
+
+PRESET_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_DEVICE_ID): cv.string,
+    vol.Required(ATTR_PRESET): _PORT,
+})
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's domain services."""
+
+    async def async_apply_routing(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        target = _resolve_routing(coordinator, call.data[ATTR_ROUTING])
+        await async_apply_routing_map(coordinator, target)
+
+    async def async_recall_preset_service(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        preset = _resolve_preset(coordinator, call.data[ATTR_PRESET])
+        await async_recall_preset(coordinator, preset)
+
+    async def async_save_preset_service(call: ServiceCall) -> None:
+        coordinator = _get_coordinator(hass, call)
+        preset = _resolve_preset(coordinator, call.data[ATTR_PRESET])
+        try:
+            await coordinator.client.preset_save(preset)
+        except ConnectionError as err:
+            raise HomeAssistantError(f"Failed to save preset {preset}: {err}") from err
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_APPLY_ROUTING, async_apply_routing, schema=APPLY_ROUTING_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_RECALL_PRESET, async_recall_preset_service, schema=PRESET_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_SAVE_PRESET, async_save_preset_service, schema=PRESET_SCHEMA
+    )
+
+
+async def async_apply_routing_map(
+    coordinator: OreiMatrixCoordinator, target: dict[int, int]
+) -> dict[int, int]:
+    """Send only the routes that differ from the current state.
+
+    Returns the output→input routes that were switched. They are shown at
+    once and confirmed (or reverted) by the coordinator, see
+    ``OreiMatrixCoordinator.async_route``.
+    """
+    state = coordinator.data or MatrixState()
+    changes = {out: inp for out, inp in target.items() if state.route(out) != inp}
+    if not changes:
+        _LOGGER.debug("apply_routing: already in requested state")
+        return changes
+
+    _LOGGER.debug("apply_routing: switching %s", changes)
+    errors = await coordinator.async_route(changes)
+    if errors:
+        raise HomeAssistantError(
+            f"{len(errors)} of {len(changes)} route changes failed: {errors[0]}"
+        ) from errors[0]
+    return changes
+
+
+async def async_recall_preset(coordinator: OreiMatrixCoordinator, preset: int) -> None:
+    """Recall a device preset with one command and one follow-up poll."""
+    try:
+        await coordinator.async_recall_preset(preset)
+    except ConnectionError as err:
+        raise HomeAssistantError(f"Failed to recall preset {preset}: {err}") from err
+
+
+def _get_coordinator(hass: HomeAssistant, call: ServiceCall) -> OreiMatrixCoordinator:
+    """Return the coordinator for the matrix a service call targets."""
+    entries: dict[str, dict[str, Any]] = hass.data.get(DOMAIN, {})
+    device_id = call.data.get(ATTR_DEVICE_ID)
+
+    if device_id is None:
+        if len(entries) != 1:
+            raise ServiceValidationError(
+                "device_id is required when more than one OREI matrix is configured"
+            )
+        return next(iter(entries.values()))["coordinator"]
+
+    device = dr.async_get(hass).async_get(device_id)
+    if device is not None:
+        for entry_id in device.config_entries:
+            if entry_id in entries:
+                return entries[entry_id]["coordinator"]
+    raise ServiceValidationError(f"No loaded OREI matrix for device {device_id}")
+
+
+def _resolve_port(value: int | str, names: tuple[str, ...], kind: str) -> int:
+    """Resolve a 1-based port number or device name to its number."""
+    if isinstance(value, int):
+        if names and not 0 < value <= len(names):
+            raise ServiceValidationError(f"Unknown {kind} {value}")
+        return value
+    if value in names:
+        return names.index(value) + 1
+    prefix = f"{kind.capitalize()} "
+    if value.startswith(prefix):
+        try:
+            return _resolve_port(int(value[len(prefix):]), names, kind)
+        except ValueError:
+            pass
+    raise ServiceValidationError(f"Unknown {kind} '{value}'")
+
+
+def _resolve_preset(coordinator: OreiMatrixCoordinator, preset: int | str) -> int:
+    """Resolve a preset number or name to its 1-based slot."""
+    state = coordinator.data or MatrixState()
+    return _resolve_port(preset, state.preset_names, "preset")
+
+
+def _resolve_routing(
+    coordinator: OreiMatrixCoordinator, routing: dict[int | str, int | str]
+) -> dict[int, int]:
+    """Resolve a user-supplied output→input map to port numbers."""
+    state = coordinator.data or MatrixState()
+    return {
+        _resolve_port(out, state.output_names, "output"): _resolve_port(
+            inp, state.input_names, "input"
+        )
+        for out, inp in routing.items()
+    }
@@ -0,0 +1,92 @@
+"""Debounce of input and output signal state for the OREI Matrix integration."""
+
+from dataclasses import replace
+
+from .models import MatrixState
+
+# Per-port MatrixState fields holding signal detection
+SIGNAL_FIELDS = ("input_active", "output_connected")
+
+
+class SignalFilter:
+    """Hold back signal changes until they have lasted, and write them together.
+
+    A changed input signal or output connection is shown only once the device
+    has reported it for ``debounce`` seconds; a lost signal must last another
+    ``loss_delay`` seconds (hysteresis, so HDCP renegotiation or a source
+    waking up does not show as a drop). A change that reverts in the meantime
+    is never shown. With ``write_interval``, changes that are due are released
+    together, at most once per interval, so a flapping source costs one
+    state write per interval rather than one per flip.
+
+    The first state seen, and any state whose port count changed, is shown as
+    it is.
+    """
+
+    __slots__ = (
+        "_last_release",
+        "_pending",
+        "_shown",
+        "debounce",
+        "loss_delay",
+        "write_interval",
+    )
+
+    def __init__(
+        self, debounce: float = 0, loss_delay: float = 0, write_interval: float = 0
+    ) -> None:
+        self.debounce = debounce
+        self.loss_delay = loss_delay
+        self.write_interval = write_interval
+        # Signal tuples currently shown, by field
+        self._shown: dict[str, tuple[bool, ...]] = {}
+        # (field, index) -> (value waiting to be shown, monotonic time first seen)
+        self._pending: dict[tuple[str, int], tuple[bool, float]] = {}
+        self._last_release = float("-inf")
+
+    @property
+    def active(self) -> bool:
+        """Return True if any change would be held back."""
+        return bool(self.debounce or self.loss_delay or self.write_interval)
+
+    def apply(self, state: MatrixState, now: float) -> tuple[MatrixState, float | None]:
+        """Return ``state`` with its signals as shown at monotonic ``now``.
+
+        Also returns when a held-back change is next due, so the caller can
+        apply the same reported state again then; None if nothing is waiting.
+        """
+        release = now >= self._last_release + self.write_interval
+        released = False
+        wake: float | None = None
+        for field in SIGNAL_FIELDS:
+            reported = getattr(state, field)
+            shown = self._shown.get(field)
+            if shown is None or len(shown) != len(reported):
+                self._shown[field] = reported
+                for key in [key for key in self._pending if key[0] == field]:
+                    del self._pending[key]
+                continue
+            values = list(shown)
+            for idx, (old, new) in enumerate(zip(shown, reported)):
+                key = (field, idx)
+                if old == new:
+                    self._pending.pop(key, None)
+                    continue
+                pending = self._pending.get(key)
+                if pending is None or pending[0] != new:
+                    pending = self._pending[key] = (new, now)
+                due = pending[1] + self.debounce + (0 if new else self.loss_delay)
+                if due <= now and release:
+                    values[idx] = new
+                    del self._pending[key]
+                    released = True
+                    continue
+                due = max(due, self._last_release + self.write_interval)
+                wake = due if wake is None else min(wake, due)
+            self._shown[field] = tuple(values)
+        if released:
+            self._last_release = now
+            if self._pending and self.write_interval:
+                # Anything still waiting goes out with the next release
+                wake = max(wake or now, now + self.write_interval)
+        return replace(state, **self._shown), wake
@@ -0,0 +1,129 @@
+"""Request latency and error statistics for the OREI Matrix client."""
+
+import math
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+# Upper bounds (seconds) of the latency histogram buckets; one overflow bucket
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Number of recent requests that percentiles and failure rates are taken over
+RECENT_SAMPLES = 100
+
+
+class RequestStats:
+    """Latency histogram and outcome counters for one request type.
+
+    Lifetime counters and the histogram cover every request since the client
+    was created; percentiles and the failure rate cover the most recent
+    ``RECENT_SAMPLES`` requests so they recover once the device does.
+    Latency is the time on the wire (device plus network); queue wait is the
+    time a request spent behind others in the client and fleet queues.
+    """
+
+    __slots__ = (
+        "failures",
+        "histogram",
+        "last_error",
+        "last_failure",
+        "last_success",
+        "queue_wait",
+        "recent",
+        "requests",
+        "timeouts",
+    )
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        # Wall-clock timestamps, for display
+        self.last_success: float | None = None
+        self.last_failure: float | None = None
+        self.last_error: str | None = None
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        # (latency, succeeded) of recent requests
+        self.recent: deque[tuple[float, bool]] = deque(maxlen=RECENT_SAMPLES)
+        self.queue_wait: deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def record(
+        self, latency: float, error: BaseException | None = None, timeout: bool = False
+    ) -> None:
+        """Record the outcome of one request."""
+        self.requests += 1
+        self.recent.append((latency, error is None))
+        if error is None:
+            self.last_success = time.time()
+            self.histogram[_bucket(latency)] += 1
+            return
+        self.failures += 1
+        self.timeouts += timeout
+        self.last_failure = time.time()
+        self.last_error = str(error) or type(error).__name__
+
+    @property
+    def latencies(self) -> list[float]:
+        """Return the latencies of recent successful requests."""
+        return [latency for latency, ok in self.recent if ok]
+
+    @property
+    def failure_rate(self) -> float | None:
+        """Return the fraction of recent requests that failed."""
+        if not self.recent:
+            return None
+        return sum(not ok for _, ok in self.recent) / len(self.recent)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable summary, latencies in milliseconds."""
+        latencies = self.latencies
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "failure_rate": self.failure_rate,
+            "latency_ms": {
+                "p50": to_ms(percentile(latencies, 50)),
+                "p95": to_ms(percentile(latencies, 95)),
+                "max": to_ms(max(latencies, default=None)),
+            },
+            "queue_wait_ms": {
+                "p50": to_ms(percentile(self.queue_wait, 50)),
+                "p95": to_ms(percentile(self.queue_wait, 95)),
+            },
+            "histogram": {
+                label: count
+                for label, count in zip(_BUCKET_LABELS, self.histogram)
+            },
+            "last_success": self.last_success,
+            "last_failure": self.last_failure,
+            "last_error": self.last_error,
+        }
+
+
+def percentile(samples: Iterable[float], pct: float) -> float | None:
+    """Return the nearest-rank percentile of ``samples``, or None if empty."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _bucket(latency: float) -> int:
+    """Return the histogram bucket index for a latency."""
+    for idx, bound in enumerate(LATENCY_BUCKETS):
+        if latency <= bound:
+            return idx
+    return len(LATENCY_BUCKETS)
+
+
+def to_ms(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+_BUCKET_LABELS = [f"<={bound * 1000:g}ms" for bound in LATENCY_BUCKETS] + [
+    f">{LATENCY_BUCKETS[-1] * 1000:g}ms"
+]
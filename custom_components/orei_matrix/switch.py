@@ -6,10 +6,10 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import DOMAIN, POWER_BOOTING, SECTION_VIDEO
 from .coordinator import OreiMatrixCoordinator
+from .entity import OreiMatrixEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,37 +22,35 @@ async def async_setup_entry(
     async_add_entities([OreiMatrixPowerSwitch(data["coordinator"], entry)])
 
 
-class OreiMatrixPowerSwitch(CoordinatorEntity[OreiMatrixCoordinator], SwitchEntity):
+class OreiMatrixPowerSwitch(OreiMatrixEntity, SwitchEntity):
     """Switch entity for matrix power on/off."""
 
-    _attr_has_entity_name = True
     _attr_name = "Power"
     _attr_icon = "mdi:power"
+    _sections = (SECTION_VIDEO,)
 
     def __init__(self, coordinator: OreiMatrixCoordinator, entry: ConfigEntry) -> None:
-        super().__init__(coordinator)
-        self._entry = entry
+        super().__init__(coordinator, entry, (("power",), ("power_state",)))
         self._attr_unique_id = f"{entry.entry_id}_power"
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._entry.entry_id)},
-            "name": self._entry.title,
-            "manufacturer": "OREI",
-            "configuration_url": f"http://{self._entry.data['host']}",
-        }
-
     @property
     def is_on(self) -> bool | None:
+        if self.coordinator.power_state == POWER_BOOTING:
+            return True
         if self.coordinator.data is None:
             return None
-        return self.coordinator.data.get("power")
+        return self.coordinator.data.power
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Expose the power lifecycle state: off, booting or on."""
+        attrs = {"power_state": self.coordinator.power_state}
+        if self.stale:
+            attrs["stale"] = True
+        return attrs
 
     async def async_turn_on(self, **kwargs) -> None:
-        await self.coordinator.client.set_power(True)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_power(True)
 
     async def async_turn_off(self, **kwargs) -> None:
-        await self.coordinator.client.set_power(False)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_power(False)
@@ -0,0 +1,354 @@
+"""Transports that carry OREI Matrix requests to the device.
+
+Requests and responses are the CGI JSON documents used by the matrix's web
+UI (``{"comhead": "video switch", ...}``), whichever wire protocol carries
+them. :class:`HttpTransport` posts them to ``/cgi-bin/instr``;
+:class:`TcpTransport` sends commands as ASCII lines over one persistent TCP
+(telnet) connection and reports state changes the device pushes on it.
+"""
+
+import asyncio
+import collections
+import hashlib
+import json
+import logging
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any
+
+import aiohttp
+
+from .const import (
+    API_PATH,
+    CONNECTION_LIMIT,
+    KEEPALIVE_TIMEOUT,
+    PROBE_INITIAL_DELAY,
+    PROBE_MAX_DELAY,
+    REQUEST_TIMEOUT,
+)
+
+try:
+    from orjson import loads as _fast_loads
+except ImportError:  # orjson ships with Home Assistant; fine without it
+    _fast_loads = json.loads
+
+_LOGGER = logging.getLogger(__name__)
+
+# Feedback kinds pushed by the device: ("route", (output, input)), ("power", bool)
+FEEDBACK_ROUTE = "route"
+FEEDBACK_POWER = "power"
+
+FeedbackListener = Callable[[str, Any], None]
+
+# Returned instead of a response when ``if_changed`` is set and the device
+# answered with the same bytes as last time
+UNCHANGED: Any = object()
+
+# ASCII replies and unsolicited feedback lines
+_ROUTE_LINE = re.compile(r"input\s*(\d+)\s*->\s*output\s*(\d+)", re.IGNORECASE)
+_POWER_LINE = re.compile(r"power\s+(on|off)", re.IGNORECASE)
+_PRESET_LINE = re.compile(r"(recall|save)\s+preset\s*(\d+)", re.IGNORECASE)
+_ERROR_LINE = re.compile(r"\berror\b", re.IGNORECASE)
+
+
+class OreiMatrixTransport(ABC):
+    """Base transport: sends one CGI JSON request and returns the response.
+
+    Implementations raise ``asyncio.TimeoutError`` when the device does not
+    answer, ``OSError`` (or ``aiohttp.ClientConnectionError``) when it cannot
+    be reached, and ``aiohttp.ClientError`` when it answers with an error.
+
+    A request sent with ``if_changed`` may return :data:`UNCHANGED` when
+    the device answers with exactly the same bytes as the last such request
+    with that comhead, so the caller can skip decoding and parsing it.
+    :meth:`forget` makes the next answer count as changed.
+    """
+
+    # True if requests may be sent before earlier ones are answered
+    pipelined = False
+
+    def __init__(self) -> None:
+        self.feedback_listener: FeedbackListener | None = None
+
+    @abstractmethod
+    async def request(
+        self, payload: dict[str, Any], if_changed: bool = False
+    ) -> dict[str, Any]:
+        """Send a request and return the device's JSON response."""
+
+    def forget(self, comhead: str) -> None:
+        """Return the next ``if_changed`` answer for ``comhead`` in full."""
+
+    async def validate(self) -> None:
+        """Check that the transport can reach the device; raise if not."""
+
+    async def close(self) -> None:
+        """Release connections held by the transport."""
+
+
+class HttpTransport(OreiMatrixTransport):
+    """POST each request to the CGI endpoint on a keep-alive session.
+
+    Pass ``session`` to share an existing session (e.g. Home Assistant's);
+    otherwise the transport creates its own with a small bounded connector
+    and closes it in :meth:`close`.
+
+    Only a digest of the last body received for each ``if_changed`` comhead
+    is kept; a body with the same digest returns :data:`UNCHANGED` without
+    being decoded.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 80,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        super().__init__()
+        self._host = host
+        self._base_url = f"http://{host}:{port}{API_PATH}"
+        self._timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        self._session = session
+        self._owns_session = session is None
+        # comhead -> digest of the last body returned for ``if_changed``
+        self._digests: dict[str, bytes] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session, creating the owned one on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout
+            )
+            self._owns_session = True
+        return self._session
+
+    async def request(
+        self, payload: dict[str, Any], if_changed: bool = False
+    ) -> dict[str, Any]:
+        """POST a request, retrying once on a dropped keep-alive socket."""
+        try:
+            return await self._post(payload, if_changed)
+        except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError):
+            # The device may drop an idle keep-alive socket between polls;
+            # retry once on a fresh connection before giving up.
+            _LOGGER.debug("Stale connection to %s, retrying", self._host)
+            return await self._post(payload, if_changed)
+
+    def forget(self, comhead: str) -> None:
+        """Drop the digest kept for ``comhead``."""
+        self._digests.pop(comhead, None)
+
+    async def _post(
+        self, payload: dict[str, Any], if_changed: bool
+    ) -> dict[str, Any]:
+        """Issue a single POST on the shared session."""
+        session = self._get_session()
+        comhead = payload.get("comhead")
+        async with session.post(
+            self._base_url, json=payload, timeout=self._timeout
+        ) as resp:
+            resp.raise_for_status()
+            body = await resp.read()
+            if if_changed:
+                digest = hashlib.blake2b(body, digest_size=16).digest()
+                if self._digests.get(comhead) == digest:
+                    _LOGGER.debug("API %s unchanged", comhead)
+                    return UNCHANGED
+            try:
+                data = _fast_loads(body)
+            except ValueError:
+                # Not UTF-8 (or not JSON): decode as aiohttp would, or raise
+                data = json.loads(body.decode(resp.get_encoding(), "replace"))
+            _LOGGER.debug("API %s -> %s", comhead, data)
+            if if_changed:
+                self._digests[comhead] = digest
+            return data
+
+    async def close(self) -> None:
+        """Close the HTTP session if owned."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+        self._session = None
+
+
+class _Pending:
+    """A sent ASCII command waiting for its reply line."""
+
+    __slots__ = ("future", "reply")
+
+    def __init__(self, reply: re.Pattern, future: asyncio.Future) -> None:
+        self.reply = reply
+        self.future = future
+
+
+class TcpTransport(OreiMatrixTransport):
+    """Send commands as ASCII lines over a persistent TCP connection.
+
+    Routing, power and preset commands are written as ``s ... !`` lines
+    without waiting for earlier replies; replies come back in order and are
+    matched to commands first-in, first-out. Route and power lines that do
+    not answer a command (front panel, IR remote, another controller) are
+    reported to :attr:`feedback_listener`, as are the replies themselves.
+
+    The ASCII protocol has no equivalent of the status queries (names,
+    presets, link and EDID state), so every other request is delegated to
+    ``http``. The connection is opened on first use and re-opened in the
+    background with exponential backoff whenever it drops.
+    """
+
+    pipelined = True
+
+    def __init__(self, host: str, port: int, http: HttpTransport) -> None:
+        super().__init__()
+        self._host = host
+        self._port = port
+        self._http = http
+        # The CGI server still takes one request at a time
+        self._http_lock = asyncio.Lock()
+        self._writer: asyncio.StreamWriter | None = None
+        self._connected = asyncio.Event()
+        self._pending: collections.deque[_Pending] = collections.deque()
+        self._runner: asyncio.Task | None = None
+        self._closing = False
+
+    async def request(
+        self, payload: dict[str, Any], if_changed: bool = False
+    ) -> dict[str, Any]:
+        """Send a command over TCP, or a status query over HTTP."""
+        if (command := _ascii_command(payload)) is None:
+            async with self._http_lock:
+                return await self._http.request(payload, if_changed)
+
+        line, reply = command
+        self._ensure_running()
+        await asyncio.wait_for(self._connected.wait(), REQUEST_TIMEOUT)
+        pending = _Pending(reply, asyncio.get_running_loop().create_future())
+        self._pending.append(pending)
+        try:
+            self._writer.write(line.encode("ascii"))
+            await self._writer.drain()
+            answer = await asyncio.wait_for(
+                asyncio.shield(pending.future), REQUEST_TIMEOUT
+            )
+        finally:
+            if pending in self._pending:
+                self._pending.remove(pending)
+        _LOGGER.debug("TCP %s -> %s", line.strip(), answer)
+        return {"comhead": payload["comhead"], "result": 1}
+
+    async def validate(self) -> None:
+        """Open the TCP connection, raising if the port does not accept it."""
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(self._host, self._port), REQUEST_TIMEOUT
+        )
+        writer.close()
+        await writer.wait_closed()
+
+    def _ensure_running(self) -> None:
+        """Start the connection task if it is not running."""
+        if self._runner is None or self._runner.done():
+            self._closing = False
+            self._runner = asyncio.get_running_loop().create_task(
+                self._run(), name=f"orei_matrix tcp {self._host}"
+            )
+
+    async def _run(self) -> None:
+        """Keep the connection open, reading lines until closed."""
+        delay = PROBE_INITIAL_DELAY
+        while not self._closing:
+            try:
+                reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self._host, self._port),
+                    REQUEST_TIMEOUT,
+                )
+            except (OSError, TimeoutError) as err:
+                _LOGGER.debug("TCP connect to %s failed: %s", self._host, err)
+            else:
+                _LOGGER.debug("TCP connected to %s:%s", self._host, self._port)
+                delay = PROBE_INITIAL_DELAY
+                self._connected.set()
+                try:
+                    while line := await reader.readline():
+                        self._handle_line(line.decode("ascii", "replace").strip())
+                except OSError as err:
+                    _LOGGER.debug("TCP connection to %s lost: %s", self._host, err)
+                self._disconnect()
+            if not self._closing:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, PROBE_MAX_DELAY)
+
+    def _disconnect(self) -> None:
+        """Drop the connection and fail commands awaiting a reply."""
+        self._connected.clear()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        while self._pending:
+            pending = self._pending.popleft()
+            if not pending.future.done():
+                pending.future.set_exception(
+                    ConnectionResetError(f"TCP connection to {self._host} lost")
+                )
+
+    def _handle_line(self, line: str) -> None:
+        """Match a line to the oldest pending command and report feedback.
+
+        An error reply fails the oldest pending command at once, so the
+        replies behind it still match their own commands.
+        """
+        if not line:
+            return
+        if self._pending and _ERROR_LINE.search(line):
+            pending = self._pending.popleft()
+            if not pending.future.done():
+                pending.future.set_exception(
+                    aiohttp.ClientError(f"OREI matrix {self._host}: {line}")
+                )
+            return
+        if self._pending and self._pending[0].reply.search(line):
+            pending = self._pending.popleft()
+            if not pending.future.done():
+                pending.future.set_result(line)
+        else:
+            _LOGGER.debug("TCP %s unsolicited: %s", self._host, line)
+
+        if self.feedback_listener is None:
+            return
+        if match := _ROUTE_LINE.search(line):
+            input_num, output_num = int(match[1]), int(match[2])
+            self.feedback_listener(FEEDBACK_ROUTE, (output_num, input_num))
+        elif match := _POWER_LINE.search(line):
+            self.feedback_listener(FEEDBACK_POWER, match[1].lower() == "on")
+
+    def forget(self, comhead: str) -> None:
+        """Forget the last status answer kept by the HTTP transport."""
+        self._http.forget(comhead)
+
+    async def close(self) -> None:
+        """Close the TCP connection and the HTTP transport."""
+        self._closing = True
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+        self._disconnect()
+        await self._http.close()
+
+
+def _ascii_command(payload: dict[str, Any]) -> tuple[str, re.Pattern] | None:
+    """Return the ASCII line and expected reply for a command, if it has one."""
+    comhead = payload.get("comhead")
+    if comhead == "video switch":
+        input_num, output_num = payload["source"]
+        return f"s in {input_num} av out {output_num}!\r\n", _ROUTE_LINE
+    if comhead == "set poweronoff":
+        return f"s power {payload['power']}!\r\n", _POWER_LINE
+    if comhead == "preset set":
+        return f"s recall preset {payload['index']}!\r\n", _PRESET_LINE
+    if comhead == "preset save":
+        return f"s save preset {payload['index']}!\r\n", _PRESET_LINE
+    return None
@@ -0,0 +1,176 @@
+"""Websocket API for the OREI Matrix Lovelace card.
+
+``orei_matrix/layout`` returns a matrix's size and the entity IDs of its
+entities; ``orei_matrix/subscribe`` pushes its state once in full and then
+only what changed, so the card never has to scan ``hass.states``. When the
+matrix's entry unloads (e.g. to reload after an options change) the
+subscription ends with ``{"closed": true}`` and the card subscribes again.
+"""
+
+from dataclasses import asdict
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_ENTRY_UNLOADED
+from .coordinator import OreiMatrixCoordinator
+from .models import MatrixState
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the card's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_layout)
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+def _get_entry_id(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> str | None:
+    """Return the requested entry, or the only one; send an error if neither."""
+    entries: dict[str, Any] = hass.data.get(DOMAIN, {})
+    entry_id = msg.get("entry_id")
+    if entry_id is None and len(entries) == 1:
+        entry_id = next(iter(entries))
+    if entry_id not in entries:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_NOT_FOUND,
+            "OREI matrix not found; set entry_id when several are configured",
+        )
+        return None
+    return entry_id
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "orei_matrix/layout",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_layout(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the matrix size and the entity IDs the card controls."""
+    if (entry_id := _get_entry_id(hass, connection, msg)) is None:
+        return
+    coordinator: OreiMatrixCoordinator = hass.data[DOMAIN][entry_id]["coordinator"]
+    registry = er.async_get(hass)
+
+    def entity_id(platform: str, suffix: str) -> str | None:
+        return registry.async_get_entity_id(platform, DOMAIN, f"{entry_id}_{suffix}")
+
+    def per_port(platform: str, pattern: str, count: int) -> dict[int, str]:
+        ids = {
+            num: entity_id(platform, pattern.format(num))
+            for num in range(1, count + 1)
+        }
+        return {num: value for num, value in ids.items() if value}
+
+    num_presets = len(coordinator.data.preset_names) if coordinator.data else 0
+    connection.send_result(
+        msg["id"],
+        {
+            "entry_id": entry_id,
+            "title": hass.config_entries.async_get_entry(entry_id).title,
+            "num_inputs": coordinator.num_inputs,
+            "num_outputs": coordinator.num_outputs,
+            "entities": {
+                "power": entity_id("switch", "power"),
+                "outputs": per_port("select", "output_{}", coordinator.num_outputs),
+                "input_signals": per_port(
+                    "binary_sensor", "input_{}_signal", coordinator.num_inputs
+                ),
+                "output_signals": per_port(
+                    "binary_sensor", "output_{}_signal", coordinator.num_outputs
+                ),
+                "presets": per_port("button", "preset_{}", num_presets),
+            },
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "orei_matrix/subscribe",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Push the matrix state, then only the fields and ports that change.
+
+    The first event is ``{"full": {...}}``; later ones are ``{"changes":
+    {...}}`` where per-port fields hold only the changed ports, e.g.
+    ``{"routing": {"2": 3}}``. The last is ``{"closed": true}`` if the entry
+    unloads while subscribed.
+    """
+    if (entry_id := _get_entry_id(hass, connection, msg)) is None:
+        return
+    coordinator: OreiMatrixCoordinator = hass.data[DOMAIN][entry_id]["coordinator"]
+    last: dict[str, Any] = {"state": coordinator.data, "status": _status(coordinator)}
+
+    @callback
+    def forward() -> None:
+        state = coordinator.data
+        status = _status(coordinator)
+        changes = dict(status.items() - last["status"].items())
+        if state is not None:
+            changes.update(_state_diff(last["state"], state))
+        last["state"], last["status"] = state, status
+        if changes:
+            connection.send_event(msg["id"], {"changes": changes})
+
+    unsubs = [coordinator.async_add_listener(forward)]
+
+    @callback
+    def unsubscribe() -> None:
+        while unsubs:
+            unsubs.pop()()
+
+    @callback
+    def entry_unloaded() -> None:
+        # The coordinator is gone; the client unsubscribing later is a no-op
+        unsubscribe()
+        connection.send_event(msg["id"], {"closed": True})
+
+    unsubs.append(
+        async_dispatcher_connect(
+            hass, SIGNAL_ENTRY_UNLOADED.format(entry_id), entry_unloaded
+        )
+    )
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    full = asdict(coordinator.data) if coordinator.data else {}
+    connection.send_event(msg["id"], {"full": {**full, **last["status"]}})
+
+
+def _status(coordinator: OreiMatrixCoordinator) -> dict[str, Any]:
+    """Return availability and the sections holding last-known data."""
+    return {
+        "available": coordinator.last_update_success,
+        "stale": tuple(sorted(coordinator.stale_sections)),
+    }
+
+
+def _state_diff(previous: MatrixState | None, state: MatrixState) -> dict[str, Any]:
+    """Return the changed fields of ``state``; per-port fields by port."""
+    if previous is None:
+        return asdict(state)
+    changes: dict[str, Any] = {}
+    for slice_ in state.changed_slices(previous):
+        field, *port = slice_
+        if port:
+            changes.setdefault(field, {})[str(port[0])] = state.port_value(
+                field, port[0]
+            )
+        else:
+            changes[field] = getattr(state, field)
+    return changes
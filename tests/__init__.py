@@ -0,0 +1 @@
+"""Tests for the OREI Matrix integration."""
@@ -0,0 +1,16 @@
+"""Fixtures for the OREI Matrix tests."""
+
+import pytest
+
+from benchmarks.simulator import MatrixSimulator
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+@pytest.fixture
+async def simulator(socket_enabled):
+    """Return a running 4x4 simulated matrix on loopback."""
+    sim = MatrixSimulator(4, 4, seed=0)
+    await sim.start()
+    yield sim
+    await sim.stop()
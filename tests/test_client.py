@@ -0,0 +1,141 @@
+"""Tests for the client queue, circuit breaker and transports."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from custom_components.orei_matrix.client import MatrixOfflineError, OreiMatrixClient
+from custom_components.orei_matrix.transport import (
+    UNCHANGED,
+    HttpTransport,
+    OreiMatrixTransport,
+    TcpTransport,
+)
+
+
+class _GatedTransport(OreiMatrixTransport):
+    """Record requests; each waits for the gate, then answers or fails."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        super().__init__()
+        self.sent: list[dict[str, Any]] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.error = error
+
+    async def request(self, payload, if_changed=False):
+        self.sent.append(payload)
+        await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        return {"comhead": payload["comhead"], "power": 1}
+
+
+def test_transport_is_abstract():
+    with pytest.raises(TypeError):
+        OreiMatrixTransport()
+
+
+async def test_coalescing_and_priority():
+    transport = _GatedTransport()
+    transport.gate.clear()
+    client = OreiMatrixClient("matrix", transport=transport)
+    first = asyncio.create_task(client.get_video_status())
+    await asyncio.sleep(0)
+    # Queued behind the request in flight
+    polls = [asyncio.create_task(client.get_output_status()) for _ in range(3)]
+    switches = [
+        asyncio.create_task(client.video_switch(input_num, 1))
+        for input_num in (2, 3)
+    ]
+    await asyncio.sleep(0)
+    transport.gate.set()
+    await asyncio.gather(first, *polls, *switches)
+    assert [payload["comhead"] for payload in transport.sent] == [
+        "get video status",
+        "video switch",
+        "get output status",
+    ]
+    # The last routing for an output wins
+    assert transport.sent[1]["source"] == [3, 1]
+    await client.async_close()
+
+
+async def test_breaker_fails_fast():
+    transport = _GatedTransport(OSError("unreachable"))
+    client = OreiMatrixClient("matrix", transport=transport)
+    states = []
+    client.add_connection_listener(states.append)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await client.get_status()
+    assert client.offline
+    assert states == [False]
+    with pytest.raises(MatrixOfflineError):
+        await client.get_video_status()
+    assert len(transport.sent) == 2
+    await client.async_close()
+
+
+async def test_uncounted_failures_keep_breaker_closed():
+    transport = _GatedTransport(OSError("booting"))
+    client = OreiMatrixClient("matrix", transport=transport)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            await client.get_status(counted=False)
+    assert not client.offline
+    await client.async_close()
+
+
+async def test_close_fails_request_in_flight():
+    transport = _GatedTransport()
+    transport.gate.clear()
+    client = OreiMatrixClient("matrix", transport=transport)
+    request = asyncio.create_task(client.get_status())
+    await asyncio.sleep(0)
+    await client.async_close()
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(request, 1)
+
+
+async def test_http_against_simulator(simulator):
+    client = OreiMatrixClient("127.0.0.1", port=simulator.port)
+    video = await client.get_video_status(if_changed=True)
+    assert video["allsource"] == [*simulator.routing, 0]
+    assert await client.get_video_status(if_changed=True) is UNCHANGED
+    # Callers that do not opt in always get the document
+    assert (await client.get_video_status())["comhead"] == "get video status"
+    await client.video_switch(4, 2)
+    assert simulator.routing[1] == 4
+    assert (await client.get_video_status(if_changed=True))["allsource"][1] == 4
+    client.forget_response("get video status")
+    assert await client.get_video_status(if_changed=True) is not UNCHANGED
+    assert client.stats["get video status"].requests == 5
+    await client.async_close()
+
+
+async def test_tcp_error_reply_fails_only_its_command(simulator):
+    tcp_port = await simulator.start_tcp()
+    transport = TcpTransport(
+        "127.0.0.1", tcp_port, HttpTransport("127.0.0.1", simulator.port)
+    )
+    client = OreiMatrixClient("127.0.0.1", transport=transport)
+    feedback = []
+    client.add_feedback_listener(lambda kind, value: feedback.append((kind, value)))
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            client.video_switch(2, 1),
+            client.video_switch(9, 2),  # no such input
+            client.video_switch(3, 3),
+            return_exceptions=True,
+        ),
+        2,
+    )
+    assert isinstance(results[1], ConnectionError)
+    assert not isinstance(results[0], Exception)
+    assert not isinstance(results[2], Exception)
+    assert simulator.routing[:3] == [2, 2, 3]
+    assert ("route", (3, 3)) in feedback
+    assert not client.offline
+    await client.async_close()
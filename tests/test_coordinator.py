@@ -0,0 +1,84 @@
+"""Tests for the coordinator against the simulated matrix."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+from custom_components.orei_matrix.client import OreiMatrixClient
+from custom_components.orei_matrix.const import POWER_BOOTING, POWER_ON
+from custom_components.orei_matrix.coordinator import OreiMatrixCoordinator
+
+
+async def _coordinator(hass, simulator) -> OreiMatrixCoordinator:
+    client = OreiMatrixClient("127.0.0.1", port=simulator.port)
+    coordinator = OreiMatrixCoordinator(hass, client)
+    await coordinator.async_refresh()
+    return coordinator
+
+
+async def _close(coordinator: OreiMatrixCoordinator) -> None:
+    await coordinator.async_shutdown()
+    await coordinator.client.async_close()
+
+
+async def test_refresh(hass, simulator):
+    coordinator = await _coordinator(hass, simulator)
+    assert coordinator.data.routing == tuple(simulator.routing)
+    assert coordinator.num_outputs == 4
+    assert coordinator.data.input_names[0] == "input1"
+    await _close(coordinator)
+
+
+async def test_route(hass, simulator):
+    coordinator = await _coordinator(hass, simulator)
+    assert await coordinator.async_route({1: 3, 2: 4}) == []
+    assert simulator.routing[:2] == [3, 4]
+    assert coordinator.data.route(1) == 3
+    await _close(coordinator)
+
+
+async def test_early_timer_fetches_only_what_is_due(hass, simulator):
+    coordinator = await _coordinator(hass, simulator)
+    now = time.monotonic()
+    coordinator._next_due.update(video=now + 1, output=now + 8, input=now + 9)
+    simulator.requests.clear()
+    coordinator._unschedule_refresh()
+    await coordinator._handle_refresh_interval()
+    assert simulator.requests == {"get video status": 1}
+    # An explicit refresh still fetches everything
+    simulator.requests.clear()
+    await coordinator.async_refresh()
+    assert set(simulator.requests) == {
+        "get video status",
+        "get output status",
+        "get input status",
+    }
+    await _close(coordinator)
+
+
+async def test_routes_wait_for_boot(hass, simulator):
+    simulator.boot_delay = 0.3
+    coordinator = await _coordinator(hass, simulator)
+    await coordinator.async_set_power(False)
+    await hass.async_block_till_done()
+    with patch(
+        "custom_components.orei_matrix.coordinator.BOOT_MIN_TIME",
+        simulator.boot_delay,
+    ):
+        # A scene switching the matrix on and routing at the same time
+        power_on = asyncio.create_task(coordinator.async_set_power(True))
+        await asyncio.sleep(0)
+        assert coordinator.power_state == POWER_BOOTING
+        assert await coordinator.async_route({1: 4}) == []
+        assert coordinator.data.route(1) == 4
+        await power_on
+        # The simulator reports power on at once but ignores commands
+        assert simulator.booting
+        assert coordinator.power_state == POWER_BOOTING
+        assert simulator.routing[0] != 4
+        await asyncio.sleep(simulator.boot_delay)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    assert coordinator.power_state == POWER_ON
+    assert simulator.routing[0] == 4
+    await _close(coordinator)
@@ -0,0 +1,41 @@
+"""Tests for network discovery."""
+
+import aiohttp
+import pytest
+
+from custom_components.orei_matrix.discovery import async_discover, parse_hosts
+
+
+def test_parse_subnet():
+    hosts = parse_hosts("192.168.1.0/30")
+    assert hosts == ["192.168.1.1", "192.168.1.2"]
+    assert len(parse_hosts("10.0.0.0/24")) == 254
+
+
+def test_parse_ranges():
+    assert parse_hosts("10.0.0.5") == ["10.0.0.5"]
+    assert parse_hosts("10.0.0.5-7") == ["10.0.0.5", "10.0.0.6", "10.0.0.7"]
+    assert parse_hosts(" 10.0.0.254-10.0.1.1 ") == [
+        "10.0.0.254",
+        "10.0.0.255",
+        "10.0.1.0",
+        "10.0.1.1",
+    ]
+
+
+@pytest.mark.parametrize(
+    "value", ["10.0.0.0/8", "10.0.0.9-5", "10.0.0.1-10.0.8.0", "matrix", "10.0.0.1-x"]
+)
+def test_parse_rejects(value):
+    with pytest.raises(ValueError):
+        parse_hosts(value)
+
+
+async def test_discover(simulator):
+    async with aiohttp.ClientSession() as session:
+        found = await async_discover(
+            session, ["127.0.0.1"], port=simulator.port
+        )
+    assert [matrix.host for matrix in found] == ["127.0.0.1"]
+    assert found[0].model == "SIM-4x4"
+    assert found[0].mac == simulator.mac
@@ -0,0 +1,55 @@
+"""Tests for the state model and the status parsers."""
+
+from dataclasses import asdict
+
+from custom_components.orei_matrix.coordinator import _parse_video
+from custom_components.orei_matrix.models import MatrixState
+
+
+def test_changed_slices_equal():
+    state = MatrixState(power=True, routing=(1, 2))
+    assert state.changed_slices(MatrixState(power=True, routing=(1, 2))) == set()
+
+
+def test_changed_slices_per_port():
+    before = MatrixState(power=True, routing=(1, 2, 3), input_names=("a", "b"))
+    after = MatrixState(power=False, routing=(1, 4, 3), input_names=("a", "c"))
+    assert after.changed_slices(before) == {
+        ("power",),
+        ("routing", 2),
+        ("input_names",),
+    }
+
+
+def test_changed_slices_port_count():
+    before = MatrixState(input_active=(True,))
+    after = MatrixState(input_active=(True, False))
+    assert after.changed_slices(before) == {("input_active", 2)}
+
+
+def test_accessors():
+    state = MatrixState(routing=(2, 0), input_names=("a", "b"))
+    assert state.route(1) == 2
+    assert state.route(2) is None  # unrouted
+    assert state.route(3) is None
+    assert state.input_name(2) == "b"
+    assert state.port_value("routing", 0) is None
+    assert state.with_route(2, 1).routing == (2, 1)
+
+
+def test_from_dict_round_trip():
+    state = MatrixState(power=True, routing=(1, 2), preset_names=("p",))
+    assert MatrixState.from_dict({**asdict(state), "unknown": 1}) == state
+
+
+def test_parse_video_keeps_unrouted_outputs():
+    parsed = _parse_video(
+        {"allsource": [1, 0, 3, 4, 0], "alloutputname": ["a", "b", "c", "d"]}
+    )
+    assert parsed["routing"] == (1, 0, 3, 4)
+    assert MatrixState(**parsed).num_outputs == 4
+
+
+def test_parse_video_without_names_drops_sentinel():
+    assert _parse_video({"allsource": [1, 0, 3, 0, 0]})["routing"] == (1, 0, 3, 0)
+    assert _parse_video({})["routing"] == ()
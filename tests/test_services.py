@@ -0,0 +1,27 @@
+"""Tests for resolving service arguments."""
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.orei_matrix.services import _resolve_port
+
+NAMES = ("Apple TV", "Input 3", "PC")
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(2, 2), ("PC", 3), ("Apple TV", 1), ("Input 2", 2), ("Input 3", 2)],
+)
+def test_resolve_port(value, expected):
+    assert _resolve_port(value, NAMES, "input") == expected
+
+
+def test_resolve_port_without_names():
+    assert _resolve_port(7, (), "output") == 7
+    assert _resolve_port("Output 7", (), "output") == 7
+
+
+@pytest.mark.parametrize("value", [0, 4, "Roku", "Input x", "Input 9"])
+def test_resolve_port_rejects(value):
+    with pytest.raises(ServiceValidationError):
+        _resolve_port(value, NAMES, "input")
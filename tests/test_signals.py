@@ -0,0 +1,65 @@
+"""Tests for the signal debounce."""
+
+from custom_components.orei_matrix.models import MatrixState
+from custom_components.orei_matrix.signals import SignalFilter
+
+
+def _state(*active: bool) -> MatrixState:
+    return MatrixState(input_active=active, output_connected=active)
+
+
+def test_first_state_shown_as_is():
+    shown, wake = SignalFilter(debounce=5).apply(_state(True, False), 0)
+    assert shown.input_active == (True, False)
+    assert wake is None
+
+
+def test_change_shown_after_debounce():
+    signals = SignalFilter(debounce=5)
+    signals.apply(_state(True), 0)
+    shown, wake = signals.apply(_state(False), 1)
+    assert shown.input_active == (True,)
+    assert wake == 6
+    shown, wake = signals.apply(_state(False), 6)
+    assert shown.input_active == (False,)
+    assert wake is None
+
+
+def test_change_that_reverts_is_never_shown():
+    signals = SignalFilter(debounce=5)
+    signals.apply(_state(True), 0)
+    signals.apply(_state(False), 1)
+    shown, wake = signals.apply(_state(True), 3)
+    assert shown.input_active == (True,)
+    assert wake is None
+    shown, _ = signals.apply(_state(True), 10)
+    assert shown.input_active == (True,)
+
+
+def test_loss_delay_applies_to_loss_only():
+    signals = SignalFilter(debounce=1, loss_delay=10)
+    signals.apply(_state(True, False), 0)
+    shown, wake = signals.apply(_state(False, True), 0)
+    assert wake == 1
+    shown, wake = signals.apply(_state(False, True), 1)
+    assert shown.input_active == (True, True)
+    assert wake == 11
+    shown, _ = signals.apply(_state(False, True), 11)
+    assert shown.input_active == (False, True)
+
+
+def test_write_interval_batches_releases():
+    signals = SignalFilter(write_interval=10)
+    signals.apply(_state(True, True), 0)
+    shown, _ = signals.apply(_state(False, True), 20)
+    assert shown.input_active == (False, True)
+    shown, wake = signals.apply(_state(False, False), 25)
+    assert shown.input_active == (False, True)
+    assert wake == 30
+    shown, _ = signals.apply(_state(False, False), 30)
+    assert shown.input_active == (False, False)
+
+
+def test_inactive_filter():
+    assert not SignalFilter().active
+    assert SignalFilter(loss_delay=1).active